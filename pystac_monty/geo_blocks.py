@@ -20,3 +20,21 @@ class GeoBlocks:
         if df.columns.size != cls._file_col_size:
             raise ValueError("Unexpected number of columns in parquet file")
         return df
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def get_block_id(cls, lat: float, lon: float) -> int:
+        """Returns the id of the block containing the point, 0 when no block contains it
+
+        Centroids are rounded to 0.1 degree by the callers, so the same points come back often.
+        """
+        geoblocks_df = cls.get_geoblocks_df()
+        geoblocks_filtered_df = geoblocks_df[
+            (geoblocks_df["lat_min"] <= lat)
+            & (geoblocks_df["lat_max"] > lat)
+            & (geoblocks_df["lon_min"] <= lon)
+            & (geoblocks_df["lon_max"] > lon)
+        ]
+        # NOTE: When we can't determine the block id, we assign 0.
+        # In parquet file, the block id starts from 1 and so on.
+        return int(geoblocks_filtered_df["block_id"].iloc[0]) if len(geoblocks_filtered_df) else 0
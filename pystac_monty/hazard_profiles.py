@@ -369,3 +369,7 @@ class MontyHazardProfiles(HazardProfiles):
         for code in cluster_codes:
             if code in max_codes:
                 return str(code)
+
+
+# Shared instance, so transformers load the hazard profiles table only once per process
+MONTY_HAZARD_PROFILES = MontyHazardProfiles()
@@ -46,16 +46,7 @@ class Pairing:
 
         geometry_lat_lon = self._return_bbox_centroid_coordinates(item.bbox)
 
-        geoblocks_df = GeoBlocks.get_geoblocks_df()
-        geoblocks_filtered_df = geoblocks_df[
-            (geoblocks_df["lat_min"] <= geometry_lat_lon[0])
-            & (geoblocks_df["lat_max"] > geometry_lat_lon[0])
-            & (geoblocks_df["lon_min"] <= geometry_lat_lon[1])
-            & (geoblocks_df["lon_max"] > geometry_lat_lon[1])
-        ]
-        # NOTE: When we can't determine the block id, we assign 0.
-        # In parquet file, the block id starts from 1 and so on.
-        block_id = int(geoblocks_filtered_df["block_id"].iloc[0]) if len(geoblocks_filtered_df) else 0
+        block_id = GeoBlocks.get_block_id(lat=geometry_lat_lon[0], lon=geometry_lat_lon[1])
         return self._construct_correlation_id_str(
             date=eventdatestr,
             country_code=country_codes[0],
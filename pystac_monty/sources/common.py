@@ -1,5 +1,4 @@
 import abc
-import json
 import re
 import tempfile
 import typing
@@ -12,6 +11,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from pystac import Collection, Item, Link
 
 from pystac_monty.geocoding import MontyGeoCoder
+from pystac_monty.sources.utils import json_loads
 
 # Characters some STAC API deployments reject in item identifiers (GDACS / Montandon ETL learnings).
 _STAC_API_ITEM_ID_FORBIDDEN = re.compile(r"[:/?#\[\]@!$&\'()*+,;=]")
@@ -186,6 +186,31 @@ class MontyDataSourceV3:
 
 DataSource = typing.TypeVar("DataSource")
 
+# Parsed remote collection documents, shared by all transformer instances
+_remote_collection_dicts: dict[str, dict] = {}
+# Keeps connections alive between collection fetches (they are all served by the same host)
+_collection_session = requests.Session()
+
+
+def _load_collection(url: str) -> Collection:
+    """Load a STAC collection from a url or a local file path
+
+    Remote documents are fetched once per process; every call still returns a new Collection.
+    """
+    # Handle local file as well
+    if url.startswith("http"):
+        collection_dict = _remote_collection_dicts.get(url)
+        if collection_dict is None:
+            response = _collection_session.get(url)
+            collection_dict = _remote_collection_dicts[url] = json_loads(response.content)
+    else:
+        with open(url, "rb") as f:
+            collection_dict = json_loads(f.read())
+    collection = Collection.from_dict(collection_dict)
+    # update self link with actual link
+    collection.set_self_href(url)
+    return collection
+
 
 @dataclass
 class MontyDataTransformer(typing.Generic[DataSource]):
@@ -224,51 +249,42 @@ class MontyDataTransformer(typing.Generic[DataSource]):
     def get_event_collection(self) -> Collection:
         """Get event collection"""
         if self._event_collection_cache is None:
-            # Handle local file as well
-            if self.events_collection_url.startswith("http"):
-                response = requests.get(self.events_collection_url)
-                collection_dict = json.loads(response.text)
-            else:
-                with open(self.events_collection_url) as f:
-                    collection_dict = json.load(f)
-            collection = Collection.from_dict(collection_dict)
-            # update self link with actual link
-            collection.set_self_href(self.events_collection_url)
-            self._event_collection_cache = collection
+            self._event_collection_cache = _load_collection(self.events_collection_url)
         return self._event_collection_cache
 
     def get_hazard_collection(self) -> Collection:
         """Get hazard collection"""
         if self._hazard_collection_cache is None:
-            # Handle local file as well
-            if self.hazards_collection_url.startswith("http"):
-                response = requests.get(self.hazards_collection_url)
-                collection_dict = json.loads(response.text)
-            else:
-                with open(self.hazards_collection_url) as f:
-                    collection_dict = json.load(f)
-            collection = Collection.from_dict(collection_dict)
-            # update self link with actual link
-            collection.set_self_href(self.hazards_collection_url)
-            self._hazard_collection_cache = collection
+            self._hazard_collection_cache = _load_collection(self.hazards_collection_url)
         return self._hazard_collection_cache
 
     def get_impact_collection(self) -> Collection:
         """Get impact collection"""
         if self._impact_collection_cache is None:
-            # Handle local file as well
-            if self.impacts_collection_url.startswith("http"):
-                response = requests.get(self.impacts_collection_url)
-                collection_dict = json.loads(response.text)
-            else:
-                with open(self.impacts_collection_url) as f:
-                    collection_dict = json.load(f)
-            collection = Collection.from_dict(collection_dict)
-            # update self link with actual link
-            collection.set_self_href(self.impacts_collection_url)
-            self._impact_collection_cache = collection
+            self._impact_collection_cache = _load_collection(self.impacts_collection_url)
         return self._impact_collection_cache
 
+    def make_derived_item(self, source_item: Item, item_id: str) -> Item:
+        """Create a new item from an already built item without deep-copying it
+
+        Geometry and bbox are shared with the source item as they are only read afterwards.
+        """
+        item = Item(
+            id=item_id,
+            geometry=source_item.geometry,
+            bbox=source_item.bbox,
+            datetime=source_item.datetime,
+            properties={
+                key: value.copy() if isinstance(value, (list, dict)) else value for key, value in source_item.properties.items()
+            },
+            stac_extensions=list(source_item.stac_extensions),
+        )
+        for key, asset in source_item.assets.items():
+            item.add_asset(key, asset.clone())
+        for link in source_item.get_links(rel="via"):
+            item.add_link(link.clone())
+        return item
+
     def add_related_links(
         self, event_item: Item, hazard_items: List[Item] | None = None, impact_items: List[Item] | None = None
     ) -> None:
@@ -1,18 +1,21 @@
 import datetime
-import json
+import functools
 import logging
+import math
 import mimetypes
 import os
+import re
 import typing
 from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, List, Tuple, Union
 
-import pytz
+import ijson
 from markdownify import markdownify as md
 from pystac import Asset, Item, Link
-from shapely import simplify, to_geojson
-from shapely.geometry import Point, mapping, shape
+from shapely import get_num_coordinates, set_precision, simplify
+from shapely.geometry import Point, Polygon, mapping, shape
+from shapely.geometry.base import BaseGeometry
 
 from pystac_monty.extension import (
     HazardDetail,
@@ -22,7 +25,8 @@ from pystac_monty.extension import (
     MontyImpactExposureCategory,
     MontyImpactType,
 )
-from pystac_monty.hazard_profiles import MontyHazardProfiles
+from pystac_monty.geocoding import MontyGeoCoder
+from pystac_monty.hazard_profiles import MONTY_HAZARD_PROFILES
 from pystac_monty.sources.common import (
     DataType,
     GdacsDataSourceType,
@@ -30,7 +34,7 @@ from pystac_monty.sources.common import (
     MontyDataSourceV3,
     MontyDataTransformer,
 )
-from pystac_monty.sources.utils import phrase_to_dashed
+from pystac_monty.sources.utils import json_loads, phrase_to_dashed
 from pystac_monty.validators.gdacs_events import GdacsEventDataValidator, Sendai
 from pystac_monty.validators.gdacs_geometry import GdacsGeometryDataValidator
 from pystac_monty.validators.gdacs_impacts import GdacsImpactDataValidatorTC, GdacsImpactDataValidatorWF, TCImpactItem
@@ -44,10 +48,176 @@ STAC_EVENT_ID_PREFIX = "gdacs-event-"
 STAC_HAZARD_ID_PREFIX = "gdacs-hazard-"
 STAC_IMPACT_ID_PREFIX = "gdacs-impact-"
 
+_UTC = datetime.timezone.utc
+_HTML_MEDIA_TYPE = mimetypes.types_map[".html"]
+
+# Bounds of the hazard geometry simplification tolerance (in degrees)
+_SIMPLIFY_MIN_TOLERANCE = 0.01
+_SIMPLIFY_MAX_TOLERANCE = 0.1
+# Fraction of the geometry bbox diagonal used as the simplification tolerance
+_SIMPLIFY_TOLERANCE_RATIO = 0.005
+# Geometries with fewer vertices than this are used as-is
+_SIMPLIFY_MIN_VERTICES = 64
+# Grid size (in degrees, ~1 m) simplified coordinates are snapped to
+_HAZARD_GEOMETRY_GRID_SIZE = 1e-5
+
+# Text markdownify may rewrite: tags, entities, escaped characters and any whitespace but a single space
+_MARKDOWN_REWRITTEN_TEXT = re.compile(r"[<&*_]|[^\S ]|  ")
+
+# GDACS event types to hazard codes (UNDRR-ISC 2025, EM-DAT, GLIDE)
+_GDACS_HAZARD_CODES: Dict[str, Tuple[str, ...]] = {
+    "EQ": ("GH0101", "nat-geo-ear-gro", "EQ"),
+    "TC": ("MH0309", "nat-met-sto-tro", "TC"),
+    "FL": ("MH0600", "nat-hyd-flo-flo", "FL"),
+    "DR": ("MH0401", "nat-cli-dro-dro", "DR"),
+    "WF": ("EN0205", "nat-cli-wil-wil", "WF"),
+    "VO": ("GH0205", "nat-geo-vol-vol", "VO"),
+    "TS": ("MH0705", "nat-geo-ear-tsu", "TS"),
+    "CW": ("MH0502", "nat-met-ext-col", "CW"),
+    "EP": ("BI0101", "nat-bio-epi-dis", "EP"),
+    "EC": ("MH0307", "nat-met-sto-ext", "EC"),
+    "ET": ("nat-met-ext-col", "ET"),
+    "FR": ("TL0032", "tec-ind-fir-fir", "FR"),
+    "FF": ("MH0603", "nat-hyd-flo-fla", "FF"),
+    "HT": ("MH0501", "nat-met-ext-hea", "HT"),
+    "IN": ("nat-bio-inf-inf", "IN"),
+    "LS": ("GH0300", "nat-geo-mmd-lan", "LS"),
+    "MS": ("GH0303", "nat-hyd-mmw-mud", "MS"),
+    "ST": ("MH0103", "nat-met-sto-sto", "ST"),
+    "SL": ("nat-hyd-mmw-lan", "SL"),
+    "AV": ("MH0801", "nat-geo-mmd-ava", "AV"),
+    "SS": ("MH0703", "nat-met-sto-sur", "SS"),
+    "AC": ("TL0053", "tec-tra-roa-roa", "AC"),
+    "TO": ("MH0305", "nat-met-sto-tor", "TO"),
+    "VW": ("MH0201", "nat-met-sto-san", "VW"),
+    "WV": ("nat-hyd-wav-rog", "WV"),
+    "OT": ("MH0701", "nat-hyd-wav-rog", "OT"),
+    "CE": ("SO0003", "CE"),
+}
+
+# Sendai (indicator type, indicator name) to Monty impact mappings, a None name matches any name
+_SENDAI_IMPACT_CATEGORIES: Dict[Tuple[str, str | None], MontyImpactExposureCategory] = {
+    ("A", None): MontyImpactExposureCategory.ALL_PEOPLE,
+    ("B", "rescued"): MontyImpactExposureCategory.ALL_PEOPLE,
+    ("B", "displaced"): MontyImpactExposureCategory.ALL_PEOPLE,
+    ("B", "affected"): MontyImpactExposureCategory.ALL_PEOPLE,
+    ("B", "injured"): MontyImpactExposureCategory.ALL_PEOPLE,
+    ("C", "houses damaged"): MontyImpactExposureCategory.BUILDINGS,
+    ("C", "houses"): MontyImpactExposureCategory.BUILDINGS,
+    ("C", "houses destroyed"): MontyImpactExposureCategory.BUILDINGS,
+    ("D", "bridges destroyed"): MontyImpactExposureCategory.BUILDINGS,
+}
+_SENDAI_IMPACT_TYPES: Dict[Tuple[str, str], MontyImpactType] = {
+    ("A", "death"): MontyImpactType.DEATH,
+    ("A", "missing"): MontyImpactType.MISSING,
+    ("B", "rescued"): MontyImpactType.ASSISTED,
+    ("B", "injured"): MontyImpactType.INJURED,
+    ("B", "displaced"): MontyImpactType.RELOCATED,
+    ("B", "affected"): MontyImpactType.TOTAL_AFFECTED,
+    ("C", "houses damaged"): MontyImpactType.DAMAGED,
+    ("C", "houses"): MontyImpactType.DAMAGED,
+    ("C", "houses destroyed"): MontyImpactType.DAMAGED,
+    ("D", "bridges destroyed"): MontyImpactType.DESTROYED,
+    ("D", "transport"): MontyImpactType.TOTAL_AFFECTED,
+}
+# Sendai indicator types that are known but not mapped yet
+_SENDAI_UNMAPPED_TYPES = ("E", "F", "G")
+
 
 logger = logging.getLogger(__name__)
 
 
+def _to_utc(value: Union[str, datetime.datetime]) -> datetime.datetime:
+    """Parse an ISO string (or take a datetime) and return it as a UTC-aware datetime"""
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return value.astimezone(_UTC) if value.tzinfo else value.replace(tzinfo=_UTC)
+
+
+def _simplify_tolerance(geometry: BaseGeometry) -> float:
+    """Simplification tolerance (in degrees) scaled with the bbox diagonal of the geometry"""
+    minx, miny, maxx, maxy = geometry.bounds
+    return max(
+        _SIMPLIFY_MIN_TOLERANCE,
+        min(_SIMPLIFY_MAX_TOLERANCE, math.hypot(maxx - minx, maxy - miny) * _SIMPLIFY_TOLERANCE_RATIO),
+    )
+
+
+def _simplify_hazard_geometry(geometry: BaseGeometry, preserve_topology: bool = False) -> BaseGeometry:
+    """Simplify a hazard footprint with a tolerance that scales with the size of the geometry
+
+    Single polygons without holes use the faster Douglas-Peucker algorithm, falling back to the
+    topology preserving simplifier if that produces an empty or invalid geometry. Passing
+    preserve_topology=True always uses the (slower) topology preserving simplifier.
+    """
+    tolerance = _simplify_tolerance(geometry)
+    if not preserve_topology and isinstance(geometry, Polygon) and not geometry.interiors:
+        simplified_geometry = simplify(geometry, tolerance=tolerance, preserve_topology=False)
+        if not simplified_geometry.is_empty and simplified_geometry.is_valid:
+            return simplified_geometry
+    return simplify(geometry, tolerance=tolerance, preserve_topology=True)
+
+
+def _make_hazard_footprint(geometry: dict, preserve_topology: bool = False) -> Tuple[dict, List[float]] | None:
+    """GeoJSON geometry and bbox of a hazard footprint, None for an empty geometry
+
+    Small geometries are used as-is, larger ones are simplified and snapped to the coordinate grid.
+    """
+    hazard_geometry = shape(geometry)
+    if hazard_geometry.is_empty:
+        return None
+    if get_num_coordinates(hazard_geometry) < _SIMPLIFY_MIN_VERTICES:
+        # Small geometries are not worth simplifying
+        return geometry, list(hazard_geometry.bounds)
+    simplified_geometry = set_precision(
+        _simplify_hazard_geometry(hazard_geometry, preserve_topology=preserve_topology),
+        grid_size=_HAZARD_GEOMETRY_GRID_SIZE,
+        mode="pointwise",
+    )
+    return mapping(simplified_geometry), list(simplified_geometry.bounds)
+
+
+def _unsupported_sendai_indicator(sendaitype: str, sendainame: str) -> ValueError:
+    """Build the error raised for a Sendai indicator without a Monty mapping"""
+    if sendaitype in _SENDAI_UNMAPPED_TYPES:
+        return ValueError(f"Method not implemented for sendai type {sendaitype} with name {sendainame}")
+    if sendaitype in ("A", "B", "C", "D"):
+        return ValueError(f"Unknown sendai name {sendainame} for indicators {sendaitype}")
+    return ValueError(f"Unknown sendai type {sendaitype} and name {sendainame}")
+
+
+def _load_hazard_geometry_data(path: str) -> GdacsGeometryDataValidator:
+    """Stream a GDACS geometry file, keeping only the feature used as the hazard footprint
+
+    Parsing stops at the first "Poly_Affected" feature, the first "Poly_area" feature is kept as a fallback.
+    """
+    selected_features = []
+    with open(path, "rb") as f:
+        for feature in ijson.items(f, "features.item", use_float=True):
+            feature_class = feature.get("properties", {}).get("Class")
+            if feature_class == "Poly_Affected":
+                selected_features = [feature]
+                break
+            if feature_class == "Poly_area" and not selected_features:
+                selected_features = [feature]
+    return GdacsGeometryDataValidator(type="FeatureCollection", features=selected_features)
+
+
+@functools.lru_cache(maxsize=128)
+def _html_to_markdown(html: str) -> str:
+    """Convert an html description to markdown, once per distinct description (episodes often repeat it)"""
+    if not _MARKDOWN_REWRITTEN_TEXT.search(html):
+        # plain text comes out of markdownify unchanged, skip the html parsing
+        return html
+    return md(html)
+
+
+@functools.lru_cache(maxsize=128)
+def _guess_media_type(url: str) -> str | None:
+    """Guess the media type of an asset url (GDACS icons are one per alert level and hazard type)"""
+    return mimetypes.guess_type(url)[0]
+
+
 class GDACSDataSourceType(Enum):
     EVENT = "geteventdata"
     GEOMETRY = "getgeometry"
@@ -100,8 +270,8 @@ class GDACSDataSource(MontyDataSourceV3):
 
     def get_data(self) -> Union[dict, str]:
         if self.root.event_data.data_type == DataType.FILE:
-            with open(self.event_data_file_path, "r", encoding="utf-8") as f:
-                self.event_data = json.loads(f.read())
+            with open(self.event_data_file_path, "rb") as f:
+                self.event_data = json_loads(f.read())
         return self.event_data
 
     def get_input_data_type(self) -> DataType:
@@ -114,10 +284,37 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
     see https://github.com/IFRCGo/monty-stac-extension/tree/main/model/sources/GDACS
     """
 
-    hazard_profiles = MontyHazardProfiles()
+    hazard_profiles = MONTY_HAZARD_PROFILES
     source_name = "gdacs"
 
+    def __init__(self, data_source: GDACSDataSource, geocoder: MontyGeoCoder, preserve_topology: bool = False) -> None:
+        super().__init__(data_source, geocoder)
+        # Always use the (slower) topology preserving simplifier for hazard geometries
+        self.preserve_topology = preserve_topology
+        # Canonical hazard codes and keywords per GDACS event type, for the hazard profiles of this transformer
+        self._event_type_hazard_codes_cache: Dict[str, Tuple[List[str], List[str]]] = {}
+
     def get_stac_items(self) -> typing.Generator[Item, None, None]:
+        self.transform_summary.mark_as_started()
+        try:
+            yield from self.get_stac_items_from_data_source()
+        finally:
+            self.transform_summary.mark_as_complete()
+
+    def get_stac_items_batch(self, data_sources: typing.Iterable[GDACSDataSource]) -> typing.Generator[Item, None, None]:
+        """Create STAC Items for several GDACS events, keeping a single transform summary for the whole batch"""
+        self.transform_summary.mark_as_started()
+        original_data_source = self.data_source
+        try:
+            for data_source in data_sources:
+                self.data_source = data_source
+                yield from self.get_stac_items_from_data_source()
+        finally:
+            self.data_source = original_data_source
+            self.transform_summary.mark_as_complete()
+
+    def get_stac_items_from_data_source(self) -> typing.Generator[Item, None, None]:
+        """Create STAC Items for the current data source"""
         data_type = self.data_source.get_input_data_type()
         match data_type:
             case DataType.FILE:
@@ -129,7 +326,6 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
 
     def get_stac_items_from_memory(self) -> typing.Generator[Item, None, None]:
         """Create STAC Items"""
-        self.transform_summary.mark_as_started()
         self.transform_summary.increment_rows(1)
 
         try:
@@ -162,6 +358,7 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
                     episode_hazard_item = self.make_hazard_event_item(
                         episode_event_data=(validated_episode_data, episode_data_url),
                         episode_geometry_data=(validated_geometry_data, geometry_data_url),
+                        event_item=episode_event_item,
                     )
                     episode_impact_items = []
                     if episode_data:
@@ -169,6 +366,7 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
                             episode_event_data=(validated_episode_data, episode_data_url),
                             episode_impact_data=validated_impact_data,
                             hazard_type=episode_data[2].hazard_type if episode_data[2] else None,
+                            event_item=episode_event_item,
                         )
 
                     all_items = [episode_event_item, episode_hazard_item] + episode_impact_items
@@ -184,30 +382,24 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         except Exception:
             self.transform_summary.increment_failed_rows(1)
             logger.warning("Failed to process the GDACS data", exc_info=True)
-        finally:
-            self.transform_summary.mark_as_complete()
 
     def get_stac_items_from_file(self) -> typing.Generator[Item, None, None]:
         """Create STAC Items"""
-        self.transform_summary.mark_as_started()
         self.transform_summary.increment_rows(1)
 
         try:
             if self.data_source.episodes:
                 for episode_data in self.data_source.episodes:
                     episode_data_file = episode_data[0].data.input_data.path
-                    with open(episode_data_file, "r", encoding="utf-8") as f:
-                        episode_file_data = json.loads(f.read())
+                    with open(episode_data_file, "rb") as f:
+                        validated_episode_data = GdacsEventDataValidator.model_validate_json(f.read())
 
-                    validated_episode_data = GdacsEventDataValidator(**episode_file_data)
                     episode_data_url = episode_data[0].data.source_url
                     episode_event_item = self.make_source_event_item(data=validated_episode_data, source_url=episode_data_url)
 
                     if GDACSDataSourceType.GEOMETRY.value == episode_data[1].type:
                         geometry_data_file = episode_data[1].data.input_data.path
-                        with open(geometry_data_file, "r", encoding="utf-8") as f:
-                            geometry_data = json.loads(f.read())
-                        validated_geometry_data = GdacsGeometryDataValidator(**geometry_data)
+                        validated_geometry_data = _load_hazard_geometry_data(geometry_data_file)
                         geometry_data_url = episode_data[1].data.source_url
                     else:
                         validated_geometry_data = None
@@ -216,8 +408,8 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
                     validated_impact_data = None
                     if episode_data[2] and GDACSDataSourceType.IMPACT.value == episode_data[2].type:
                         impact_data_file = episode_data[2].data.input_data.path
-                        with open(impact_data_file, "r", encoding="utf-8") as f:
-                            impact_data = json.loads(f.read())
+                        with open(impact_data_file, "rb") as f:
+                            impact_data = json_loads(f.read())
 
                         match episode_data[2].hazard_type:
                             case HazardType.TC:
@@ -230,6 +422,7 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
                     episode_hazard_item = self.make_hazard_event_item(
                         episode_event_data=(validated_episode_data, episode_data_url),
                         episode_geometry_data=(validated_geometry_data, geometry_data_url),
+                        event_item=episode_event_item,
                     )
 
                     episode_impact_items = []
@@ -238,6 +431,7 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
                             episode_event_data=(validated_episode_data, episode_data_url),
                             episode_impact_data=validated_impact_data,
                             hazard_type=episode_data[2].hazard_type if episode_data[2] else None,
+                            event_item=episode_event_item,
                         )
 
                     all_items = [episode_event_item, episode_hazard_item] + episode_impact_items
@@ -253,122 +447,91 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         except Exception:
             self.transform_summary.increment_failed_rows(1)
             logger.warning("Failed to process the GDACS data", exc_info=True)
-        finally:
-            self.transform_summary.mark_as_complete()
 
     # FIXME: This is deprecated
     def make_items(self) -> List[Item]:
         return list(self.get_stac_items())
 
     def get_hazard_codes(self, hazard: str) -> List[str]:
-        hazard_mapping = {
-            "EQ": ["GH0101", "nat-geo-ear-gro", "EQ"],
-            "TC": ["MH0309", "nat-met-sto-tro", "TC"],
-            "FL": ["MH0600", "nat-hyd-flo-flo", "FL"],
-            "DR": ["MH0401", "nat-cli-dro-dro", "DR"],
-            "WF": ["EN0205", "nat-cli-wil-wil", "WF"],
-            "VO": ["GH0205", "nat-geo-vol-vol", "VO"],
-            "TS": ["MH0705", "nat-geo-ear-tsu", "TS"],
-            "CW": ["MH0502", "nat-met-ext-col", "CW"],
-            "EP": ["BI0101", "nat-bio-epi-dis", "EP"],
-            "EC": ["MH0307", "nat-met-sto-ext", "EC"],
-            "ET": ["nat-met-ext-col", "ET"],
-            "FR": ["TL0032", "tec-ind-fir-fir", "FR"],
-            "FF": ["MH0603", "nat-hyd-flo-fla", "FF"],
-            "HT": ["MH0501", "nat-met-ext-hea", "HT"],
-            "IN": ["nat-bio-inf-inf", "IN"],
-            "LS": ["GH0300", "nat-geo-mmd-lan", "LS"],
-            "MS": ["GH0303", "nat-hyd-mmw-mud", "MS"],
-            "ST": ["MH0103", "nat-met-sto-sto", "ST"],
-            "SL": ["nat-hyd-mmw-lan", "SL"],
-            "AV": ["MH0801", "nat-geo-mmd-ava", "AV"],
-            "SS": ["MH0703", "nat-met-sto-sur", "SS"],
-            "AC": ["TL0053", "tec-tra-roa-roa", "AC"],
-            "TO": ["MH0305", "nat-met-sto-tor", "TO"],
-            "VW": ["MH0201", "nat-met-sto-san", "VW"],
-            "WV": ["nat-hyd-wav-rog", "WV"],
-            "OT": ["MH0701", "nat-hyd-wav-rog", "OT"],
-            "CE": ["SO0003", "CE"],
-        }
-        if hazard not in hazard_mapping:
+        hazard_codes = _GDACS_HAZARD_CODES.get(hazard)
+        if hazard_codes is None:
             logger.warning("Hazard %s not found.", hazard)
-        return hazard_mapping.get(hazard, [])
+            return []
+        return list(hazard_codes)
 
     def make_source_event_item(self, data: GdacsEventDataValidator, source_url: str) -> Item:
         """Create an event item"""
+        event_properties = data.properties
+
         # Build the identifier for the item
-        id = STAC_EVENT_ID_PREFIX + str(data.properties.eventid) + "-" + str(data.properties.episodeid)
+        id = f"{STAC_EVENT_ID_PREFIX}{event_properties.eventid}-{event_properties.episodeid}"
 
         # Select the description
-        if data.properties.htmldescription:
+        if event_properties.htmldescription:
             # translate the description to markdown
-            description = md(data.properties.htmldescription)
+            description = _html_to_markdown(event_properties.htmldescription)
         else:
-            description = data.properties.description
+            description = event_properties.description
 
-        startdate_str = data.properties.fromdate
-        if isinstance(startdate_str, str):
-            startdate = pytz.utc.localize(datetime.datetime.fromisoformat(startdate_str))
-        else:
-            startdate = pytz.utc.localize(startdate_str)
-        enddate_str = data.properties.todate
-        if isinstance(enddate_str, str):
-            enddate = pytz.utc.localize(datetime.datetime.fromisoformat(enddate_str))
-        else:
-            enddate = pytz.utc.localize(enddate_str)
+        startdate = _to_utc(event_properties.fromdate)
+        enddate = _to_utc(event_properties.todate)
 
         item = Item(
             id=id,
-            geometry=dict(data.geometry),
+            geometry=data.geometry_dict,
             bbox=data.bbox,
             datetime=startdate,
             properties={
-                "title": data.properties.name,
+                "title": event_properties.name,
                 "description": description,
                 "start_datetime": startdate.isoformat(),
                 "end_datetime": enddate.isoformat(),
-                "severitydata": data.properties.severitydata.model_dump(),
+                "severitydata": event_properties.severitydata.model_dump(),
             },
         )
 
         # Monty extension fields
-        MontyExtension.add_to(item)
-        monty = MontyExtension.ext(item)
-        monty.src_event_id = str(data.properties.eventid)
-        monty.episode_number = data.properties.episodeid
-        monty.hazard_codes = self.get_hazard_codes(data.properties.eventtype)
-        monty.hazard_codes = self.hazard_profiles.get_canonical_hazard_codes(item=item)
-
-        cc = set([data.properties.iso3.strip()])
-        if hasattr(data.properties, "affectedcountries"):
-            cc.update([c.iso3.strip() for c in data.properties.affectedcountries])
-        cc = list(cc)
-        cc = list(filter(None, cc))
+        monty = MontyExtension.ext(item, add_if_missing=True)
+        monty.src_event_id = str(event_properties.eventid)
+        monty.episode_number = event_properties.episodeid
+        cached_hazard_codes = self._event_type_hazard_codes_cache.get(event_properties.eventtype)
+        if cached_hazard_codes is None:
+            monty.hazard_codes = self.get_hazard_codes(event_properties.eventtype)
+            canonical_hazard_codes = self.hazard_profiles.get_canonical_hazard_codes(item=item)
+            cached_hazard_codes = self._event_type_hazard_codes_cache[event_properties.eventtype] = (
+                canonical_hazard_codes,
+                self.hazard_profiles.get_keywords(canonical_hazard_codes),
+            )
+        canonical_hazard_codes, hazard_keywords = cached_hazard_codes
+        monty.hazard_codes = list(canonical_hazard_codes)
+
+        # dict.fromkeys de-duplicates while keeping the event's own iso3 first
+        affected_iso3 = (country.iso3 for country in getattr(event_properties, "affectedcountries", ()))
+        cc = [iso3 for iso3 in dict.fromkeys(code.strip() for code in (event_properties.iso3, *affected_iso3)) if iso3]
         if cc:
             monty.country_codes = cc
         else:
             monty.country_codes = ["UNK"]  # Set UNK when no country code is available
 
-        hazard_keywords = self.hazard_profiles.get_keywords(monty.hazard_codes)
-
-        item.properties["keywords"] = list(set(hazard_keywords + list(cc)))
+        item.properties["keywords"] = list(dict.fromkeys([*hazard_keywords, *cc]))
 
         monty.compute_and_set_correlation_id(hazard_profiles=self.hazard_profiles)
 
         # assets
         # icon
+        icon_href = str(event_properties.icon)
         item.add_asset(
             "icon",
-            Asset(href=str(data.properties.icon), media_type=mimetypes.guess_type(str(data.properties.icon))[0], title="Icon"),
+            Asset(href=icon_href, media_type=_guess_media_type(icon_href), title="Icon"),
         )
 
         # report
-        if hasattr(data.properties.url, "report"):
+        if hasattr(event_properties.url, "report"):
             item.add_asset(
                 "report",
                 Asset(
-                    href=str(data.properties.url.report),
-                    media_type=mimetypes.types_map[".html"],
+                    href=str(event_properties.url.report),
+                    media_type=_HTML_MEDIA_TYPE,
                     title="Report",
                 ),
             )
@@ -386,36 +549,37 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         self,
         episode_event_data: Tuple[GdacsEventDataValidator, str],
         episode_geometry_data: Tuple[GdacsGeometryDataValidator | None, str | None],
+        event_item: Item | None = None,
     ) -> Item:
         """Create a hazard item"""
-        item = self.make_source_event_item(*episode_event_data)
+        if event_item is None:
+            event_item = self.make_source_event_item(*episode_event_data)
+        item = self.make_derived_item(
+            source_item=event_item, item_id=event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_HAZARD_ID_PREFIX)
+        )
 
         episode_event = episode_event_data[0]
         episode_geometry = episode_geometry_data[0]
 
-        item.id = item.id.replace(STAC_EVENT_ID_PREFIX, STAC_HAZARD_ID_PREFIX)
         item.set_collection(self.get_hazard_collection())
         item.properties["roles"] = ["source", "hazard"]
         item.properties["source"] = episode_event.properties.source
 
-        hazard_geometry = None
-
         if episode_geometry:
             # geometry data is a FeatureCollection so we must find the proper feature
-            # that has the properties.class == "Poly_Affected"
-            for feature in episode_geometry.features:
-                if hasattr(feature.properties, "Class") and feature.properties.Class == "Poly_Affected":
-                    hazard_geometry = shape(dict(feature.geometry))
-                    break
-                if hasattr(feature.properties, "Class") and feature.properties.Class == "Poly_area":
-                    hazard_geometry = shape(dict(feature.geometry))
-                    break
-
-            if hazard_geometry:
-                # We often need to simplify the geometry using shapely
-                simplified_geometry = simplify(hazard_geometry, tolerance=0.1, preserve_topology=True)
-                item.geometry = json.loads(to_geojson(simplified_geometry))
-                item.bbox = list(simplified_geometry.bounds)
+            # that has the properties.class == "Poly_Affected", falling back to "Poly_area"
+            features = episode_geometry.features
+            selected_feature = next(
+                (feature for feature in features if getattr(feature.properties, "Class", None) == "Poly_Affected"), None
+            ) or next((feature for feature in features if getattr(feature.properties, "Class", None) == "Poly_area"), None)
+
+            # Only the selected feature is dumped and turned into a shapely geometry
+            selected_geometry = selected_feature.geometry_dict if selected_feature else None
+            hazard_footprint = (
+                _make_hazard_footprint(selected_geometry, preserve_topology=self.preserve_topology) if selected_geometry else None
+            )
+            if hazard_footprint:
+                item.geometry, item.bbox = hazard_footprint
 
         # Monty extension fields
         monty = MontyExtension.ext(item)
@@ -443,27 +607,39 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         episode_event_data: Tuple[GdacsEventDataValidator, str],
         episode_impact_data: GdacsImpactDataValidatorTC | GdacsImpactDataValidatorWF | None,
         hazard_type: HazardType,
+        event_item: Item | None = None,
     ) -> list[Item]:
         impact_items = []
 
         episode_event = episode_event_data[0]
+        sendai = getattr(episode_event.properties, "sendai", None)
+        if not sendai and not episode_impact_data:
+            # Hazard-only alert, nothing to derive impacts from
+            return impact_items
+
+        if event_item is None:
+            # Build the source event item once and derive every impact item from it
+            event_item = self.make_source_event_item(*episode_event_data)
 
         # Search for Sendai fields
-        if hasattr(episode_event.properties, "sendai"):
-            sendai = episode_event.properties.sendai
-            if sendai:
-                for idx, sendai_data in enumerate(sendai):
-                    impact_item = self.make_impact_item_from_sendai_entry(
-                        idx=idx, episode_event_data=episode_event_data, sendai_data=sendai_data
-                    )
-                    if impact_item:
-                        impact_items.append(impact_item)
+        if sendai:
+            country_name_to_iso3 = self.get_country_name_to_iso3(episode_event)
+            for idx, sendai_data in enumerate(sendai):
+                impact_item = self.make_impact_item_from_sendai_entry(
+                    idx=idx,
+                    episode_event_data=episode_event_data,
+                    sendai_data=sendai_data,
+                    event_item=event_item,
+                    country_name_to_iso3=country_name_to_iso3,
+                )
+                if impact_item:
+                    impact_items.append(impact_item)
         if episode_impact_data:
             match hazard_type:
                 case HazardType.TC:
                     for impact_data in episode_impact_data.channel.item:
                         impact_item = self.make_impact_item_from_tc(
-                            impact_data=impact_data, episode_event_data=episode_event_data
+                            impact_data=impact_data, episode_event_data=episode_event_data, event_item=event_item
                         )
                         if impact_item:
                             impact_items.append(impact_item)
@@ -484,18 +660,25 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
                             impact_value=pop_affected,
                             episode_id=episode_impact_data.episodeid,
                             episode_event_data=episode_event_data,
+                            event_item=event_item,
                         )
                         if impact_item:
                             impact_items.append(impact_item)
         return impact_items
 
     def make_impact_item_from_wf(
-        self, impact_value: str, episode_id: str, episode_event_data: Tuple[GdacsEventDataValidator, str]
+        self,
+        impact_value: str,
+        episode_id: str,
+        episode_event_data: Tuple[GdacsEventDataValidator, str],
+        event_item: Item | None = None,
     ) -> Item | None:
         """Create impact item for WildFire"""
-        item = self.make_source_event_item(*episode_event_data)
+        if event_item is None:
+            event_item = self.make_source_event_item(*episode_event_data)
         ## TODO add more to make the item id unique
-        item.id = phrase_to_dashed(item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX) + episode_id)
+        impact_id_prefix = event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
+        item = self.make_derived_item(source_item=event_item, item_id=phrase_to_dashed(f"{impact_id_prefix}{episode_id}"))
         item.set_collection(self.get_impact_collection())
         item.properties["roles"] = ["source", "impact"]
 
@@ -519,23 +702,25 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         return pt, list(bbox)
 
     def make_impact_item_from_tc(
-        self, impact_data: TCImpactItem, episode_event_data: Tuple[GdacsEventDataValidator, str]
+        self,
+        impact_data: TCImpactItem,
+        episode_event_data: Tuple[GdacsEventDataValidator, str],
+        event_item: Item | None = None,
     ) -> Item | None:
         """Create impact item for Tropical Cyclone (TC)"""
-        item = self.make_source_event_item(*episode_event_data)
-        item.id = phrase_to_dashed(
-            item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
-            + "-"
-            + impact_data.id
-            + "-"
-            + impact_data.advisory_number
-        )
         if impact_data:
             geo_point, bbox = self.generate_geo_info(coord_str=impact_data.coordinates)
         else:
             geo_point, bbox = None, None
         if not geo_point:
             return None
+        if event_item is None:
+            event_item = self.make_source_event_item(*episode_event_data)
+        impact_id_prefix = event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
+        item = self.make_derived_item(
+            source_item=event_item,
+            item_id=phrase_to_dashed(f"{impact_id_prefix}-{impact_data.id}-{impact_data.advisory_number}"),
+        )
         item.geometry = mapping(geo_point)
         item.bbox = bbox
         item.common_metadata.description = impact_data.name
@@ -544,7 +729,7 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         try:
             item.datetime = item.common_metadata.created = item.common_metadata.start_datetime = (
                 item.common_metadata.end_datetime
-            ) = pytz.utc.localize(datetime.datetime.strptime(impact_data.advisory_datetime, "%d %b %Y %H:%M"))
+            ) = _to_utc(datetime.datetime.strptime(impact_data.advisory_datetime, "%d %b %Y %H:%M"))
         except Exception:
             item.datetime = item.common_metadata.created = item.common_metadata.start_datetime = (
                 item.common_metadata.end_datetime
@@ -562,53 +747,52 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
         )
         return item
 
+    @staticmethod
+    def get_country_name_to_iso3(data: GdacsEventDataValidator) -> Dict[str, str]:
+        """Map affected country names to their iso3 code, keeping the first entry for duplicate names"""
+        return {country.countryname: country.iso3 for country in reversed(data.properties.affectedcountries)}
+
     def make_impact_item_from_sendai_entry(
-        self, idx: int, episode_event_data: Tuple[GdacsEventDataValidator, str], sendai_data: Sendai
+        self,
+        idx: int,
+        episode_event_data: Tuple[GdacsEventDataValidator, str],
+        sendai_data: Sendai,
+        event_item: Item | None = None,
+        country_name_to_iso3: Dict[str, str] | None = None,
     ) -> Item | None:
         """Create impact item for Flood using Sendai framework"""
-        item = self.make_source_event_item(*episode_event_data)
-        item.id = phrase_to_dashed(
-            item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
-            + "-"
-            + sendai_data.sendaitype
-            + "-"
-            + sendai_data.sendainame
-            + "-"
-            + sendai_data.country
-            + "-"
-            + sendai_data.region
-            + "-"
-            + str(idx)
+        impact_detail = self.get_impact_detail(sendai_data)
+        if not impact_detail:
+            return None
+
+        if event_item is None:
+            event_item = self.make_source_event_item(*episode_event_data)
+        impact_id_prefix = event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
+        item = self.make_derived_item(
+            source_item=event_item,
+            item_id=phrase_to_dashed(
+                f"{impact_id_prefix}-{sendai_data.sendaitype}-{sendai_data.sendainame}"
+                f"-{sendai_data.country}-{sendai_data.region}-{idx}"
+            ),
         )
         item.common_metadata.description = sendai_data.description
         # TODO geolocate the with country and region metadata
         # item.geometry = self.geolocate(entry["country"], entry["region"])
+        # NOTE: resolve through self.geocoder once per event (not per entry); if point-in-polygon
+        # checks are needed, query a shapely.STRtree of the country polygons built once per transformer.
         item.set_collection(self.get_impact_collection())
         item.properties["roles"] = ["source", "impact"]
-        if isinstance(sendai_data.dateinsert, str):
-            item.common_metadata.created = pytz.utc.localize(datetime.datetime.fromisoformat(sendai_data.dateinsert))
-        else:
-            item.common_metadata.created = pytz.utc.localize(sendai_data.dateinsert)
-        if isinstance(sendai_data.onset_date, str):
-            item.common_metadata.start_datetime = pytz.utc.localize(datetime.datetime.fromisoformat(sendai_data.onset_date))
-        else:
-            item.common_metadata.start_datetime = pytz.utc.localize(sendai_data.onset_date)
-        if isinstance(sendai_data.expires_date, str):
-            item.common_metadata.end_datetime = pytz.utc.localize(datetime.datetime.fromisoformat(sendai_data.expires_date))
-        else:
-            item.common_metadata.end_datetime = pytz.utc.localize(sendai_data.expires_date)
+        item.common_metadata.created = _to_utc(sendai_data.dateinsert)
+        item.common_metadata.start_datetime = _to_utc(sendai_data.onset_date)
+        item.common_metadata.end_datetime = _to_utc(sendai_data.expires_date)
 
         # Monty extension fields
         monty = MontyExtension.ext(item)
         # impact_detail
-        impact_detail = self.get_impact_detail(sendai_data)
-        if not impact_detail:
-            return None
         monty.impact_detail = impact_detail
-        country_code = next(
-            (cc.iso3 for cc in episode_event_data[0].properties.affectedcountries if cc.countryname == sendai_data.country),
-            None,
-        )
+        if country_name_to_iso3 is None:
+            country_name_to_iso3 = self.get_country_name_to_iso3(episode_event_data[0])
+        country_code = country_name_to_iso3.get(sendai_data.country)
         monty.country_codes = [country_code if country_code else episode_event_data[0].properties.iso3]
 
         return item
@@ -629,145 +813,14 @@ class GDACSTransformer(MontyDataTransformer[GDACSDataSource]):
 
     @staticmethod
     def get_impact_category_from_sendai_indicators(sendaitype: str, sendainame: str) -> MontyImpactExposureCategory:
-        if sendaitype == "A":
-            return GDACSTransformer.get_impact_category_from_sendai_a(sendainame)
-        elif sendaitype == "B":
-            return GDACSTransformer.get_impact_category_from_sendai_b(sendainame)
-        elif sendaitype == "C":
-            return GDACSTransformer.get_impact_category_from_sendai_c(sendainame)
-        elif sendaitype == "D":
-            return GDACSTransformer.get_impact_category_from_sendai_d(sendainame)
-        elif sendaitype == "E":
-            return GDACSTransformer.get_impact_category_from_sendai_e(sendainame)
-        elif sendaitype == "F":
-            return GDACSTransformer.get_impact_category_from_sendai_f(sendainame)
-        elif sendaitype == "G":
-            return GDACSTransformer.get_impact_category_from_sendai_g(sendainame)
-        else:
-            raise ValueError(f"Unknown sendai type {sendaitype} and name {sendainame}")
-
-    @staticmethod
-    def get_impact_category_from_sendai_a(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        return MontyImpactExposureCategory.ALL_PEOPLE
-
-    @staticmethod
-    def get_impact_category_from_sendai_b(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        if sendainame == "rescued" or sendainame == "displaced" or sendainame == "affected" or sendainame == "injured":
-            return MontyImpactExposureCategory.ALL_PEOPLE
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators B")
-
-    @staticmethod
-    def get_impact_category_from_sendai_c(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        if sendainame == "houses damaged" or sendainame == "houses" or sendainame == "houses destroyed":
-            return MontyImpactExposureCategory.BUILDINGS
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators C")
-
-    @staticmethod
-    def get_impact_category_from_sendai_d(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        if sendainame == "bridges destroyed":
-            return MontyImpactExposureCategory.BUILDINGS
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators D")
-
-    @staticmethod
-    def get_impact_category_from_sendai_e(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        # Implement this method if needed
-        raise ValueError(f"Method not implemented for sendai type E with name {sendainame}")
-
-    @staticmethod
-    def get_impact_category_from_sendai_f(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        # Implement this method if needed
-        raise ValueError(f"Method not implemented for sendai type F with name {sendainame}")
-
-    @staticmethod
-    def get_impact_category_from_sendai_g(
-        sendainame: str,
-    ) -> MontyImpactExposureCategory:
-        # Implement this method if needed
-        raise ValueError(f"Method not implemented for sendai type G with name {sendainame}")
+        category = _SENDAI_IMPACT_CATEGORIES.get((sendaitype, sendainame)) or _SENDAI_IMPACT_CATEGORIES.get((sendaitype, None))
+        if category is None:
+            raise _unsupported_sendai_indicator(sendaitype, sendainame)
+        return category
 
     @staticmethod
     def get_impact_type_from_sendai_indicators(sendaitype: str, sendainame: str) -> MontyImpactType:
-        if sendaitype == "A":
-            return GDACSTransformer.get_impact_type_from_sendai_a(sendainame)
-        elif sendaitype == "B":
-            return GDACSTransformer.get_impact_type_from_sendai_b(sendainame)
-        elif sendaitype == "C":
-            return GDACSTransformer.get_impact_type_from_sendai_c(sendainame)
-        elif sendaitype == "D":
-            return GDACSTransformer.get_impact_type_from_sendai_d(sendainame)
-        elif sendaitype == "E":
-            return GDACSTransformer.get_impact_type_from_sendai_e(sendainame)
-        elif sendaitype == "F":
-            return GDACSTransformer.get_impact_type_from_sendai_f(sendainame)
-        elif sendaitype == "G":
-            return GDACSTransformer.get_impact_type_from_sendai_g(sendainame)
-        else:
-            raise ValueError(f"Unknown sendai type {sendaitype} and name {sendainame}")
-
-    @staticmethod
-    def get_impact_type_from_sendai_a(sendainame: str) -> MontyImpactType:
-        if sendainame == "death":
-            return MontyImpactType.DEATH
-        elif sendainame == "missing":
-            return MontyImpactType.MISSING
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators A")
-
-    @staticmethod
-    def get_impact_type_from_sendai_b(sendainame: str) -> MontyImpactType:
-        if sendainame == "rescued":
-            return MontyImpactType.ASSISTED
-        elif sendainame == "injured":
-            return MontyImpactType.INJURED
-        elif sendainame == "displaced":
-            return MontyImpactType.RELOCATED
-        elif sendainame == "affected":
-            return MontyImpactType.TOTAL_AFFECTED
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators B")
-
-    @staticmethod
-    def get_impact_type_from_sendai_c(sendainame: str) -> MontyImpactType:
-        if sendainame == "houses damaged" or sendainame == "houses" or sendainame == "houses destroyed":
-            return MontyImpactType.DAMAGED
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators C")
-
-    @staticmethod
-    def get_impact_type_from_sendai_d(sendainame: str) -> MontyImpactType:
-        if sendainame == "bridges destroyed":
-            return MontyImpactType.DESTROYED
-        elif sendainame == "transport":
-            return MontyImpactType.TOTAL_AFFECTED
-        else:
-            raise ValueError(f"Unknown sendai name {sendainame} for indicators D")
-
-    @staticmethod
-    def get_impact_type_from_sendai_e(sendainame: str) -> MontyImpactType:
-        # Implement this method if needed
-        raise ValueError(f"Method not implemented for sendai type E with name {sendainame}")
-
-    @staticmethod
-    def get_impact_type_from_sendai_f(sendainame: str) -> MontyImpactType:
-        # Implement this method if needed
-        raise ValueError(f"Method not implemented for sendai type F with name {sendainame}")
-
-    @staticmethod
-    def get_impact_type_from_sendai_g(sendainame: str) -> MontyImpactType:
-        # Implement this method if needed
-        raise ValueError(f"Method not implemented for sendai type G with name {sendainame}")
+        impact_type = _SENDAI_IMPACT_TYPES.get((sendaitype, sendainame))
+        if impact_type is None:
+            raise _unsupported_sendai_indicator(sendaitype, sendainame)
+        return impact_type
@@ -1,11 +1,11 @@
-import json
 import logging
 import os
 import typing
-from datetime import datetime
-from typing import List, Union
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Tuple, Union
 
-import pytz
+import ijson
+import numpy as np
 from pystac import Item
 
 from pystac_monty.extension import (
@@ -16,7 +16,8 @@ from pystac_monty.extension import (
     MontyImpactExposureCategory,
     MontyImpactType,
 )
-from pystac_monty.hazard_profiles import MontyHazardProfiles
+from pystac_monty.geocoding import MontyGeoCoder
+from pystac_monty.hazard_profiles import MONTY_HAZARD_PROFILES
 from pystac_monty.sources.common import (
     DataType,
     File,
@@ -35,6 +36,18 @@ STAC_EVENT_ID_PREFIX = "gfd-event-"
 STAC_HAZARD_ID_PREFIX = "gfd-hazard-"
 STAC_IMPACT_ID_PREFIX = "gfd-impact-"
 
+# Footprints with more points than this get their bounding box from numpy
+_NUMPY_BBOX_MIN_POINTS = 32
+
+# GFD is a Flood related source
+_GFD_HAZARD_CODES = ("MH0600", "nat-hyd-flo-flo", "FL")
+
+# Source field, exposure category and impact type of the impact items created for each row
+_IMPACT_FIELDS = (
+    ("dfo_dead", MontyImpactExposureCategory.ALL_PEOPLE, MontyImpactType.DEATH),
+    ("dfo_displaced", MontyImpactExposureCategory.ALL_PEOPLE, MontyImpactType.TOTAL_DISPLACED_PERSONS),
+)
+
 
 class GFDDataSource(MontyDataSourceV3):
     """GFD Data from the source"""
@@ -68,13 +81,17 @@ class GFDDataSource(MontyDataSourceV3):
             case _:
                 typing.assert_never(input_data_type)
 
-    def get_data(self) -> Union[dict, str]:
-        """Get the data"""
+    def get_data(self) -> Iterable[dict]:
+        """Get the data, file rows are decoded lazily while they are iterated"""
         if self.input_data.data_type == DataType.FILE:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                return json.loads(f.read())
+            return self._iter_file_rows()
         return self.data
 
+    def _iter_file_rows(self) -> Iterator[dict]:
+        """Stream the rows of the top-level JSON array, only the current row is kept in memory"""
+        with open(self.file_path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True)
+
     def get_input_data_type(self) -> DataType:
         """Get the input data type"""
         return self.input_data.data_type
@@ -83,9 +100,14 @@ class GFDDataSource(MontyDataSourceV3):
 class GFDTransformer(MontyDataTransformer[GFDDataSource]):
     """Transform the source data into the STAC items"""
 
-    hazard_profiles = MontyHazardProfiles()
+    hazard_profiles = MONTY_HAZARD_PROFILES
     source_name = "gfd"
 
+    def __init__(self, data_source: GFDDataSource, geocoder: MontyGeoCoder) -> None:
+        super().__init__(data_source, geocoder)
+        # Canonical hazard codes and keywords, computed for the first event of this transformer
+        self._hazard_codes_cache: Tuple[List[str], List[str]] | None = None
+
     # FIXME: This is deprecated
     def make_items(self) -> List[Item]:
         return list(self.get_stac_items())
@@ -94,50 +116,75 @@ class GFDTransformer(MontyDataTransformer[GFDDataSource]):
         data = self.data_source.get_data()
 
         self.transform_summary.mark_as_started()
-        for row in data:
-            self.transform_summary.increment_rows()
-            try:
-                data = GFDSourceValidator(**row)
-                if event_item := self.make_source_event_item(data):
-                    hazard_item = self.make_hazard_event_item(event_item, data)
-                    impact_items = self.make_impact_items(event_item, data)
-
-                    all_items = [event_item, hazard_item] + impact_items
-                    self.set_item_hrefs(items=all_items, eoapi_url=self.data_source.eoapi_url)
-                    self.add_related_links(event_item=event_item, hazard_items=[hazard_item], impact_items=impact_items)
-
-                    yield event_item
-                    yield hazard_item
-                    yield from impact_items
-                else:
+        try:
+            for row in data:
+                self.transform_summary.increment_rows()
+                try:
+                    data = GFDSourceValidator.model_validate(row)
+                    if event_item := self.make_source_event_item(data):
+                        hazard_item = self.make_hazard_event_item(event_item, data)
+                        impact_items = self.make_impact_items(event_item, data)
+
+                        all_items = [event_item, hazard_item] + impact_items
+                        self.set_item_hrefs(items=all_items, eoapi_url=self.data_source.eoapi_url)
+                        self.add_related_links(event_item=event_item, hazard_items=[hazard_item], impact_items=impact_items)
+
+                        yield event_item
+                        yield hazard_item
+                        yield from impact_items
+                    else:
+                        self.transform_summary.increment_failed_rows()
+                except Exception:
                     self.transform_summary.increment_failed_rows()
-            except Exception:
-                self.transform_summary.increment_failed_rows()
-                logger.warning("Failed to process GFD data", exc_info=True)
+                    logger.warning("Failed to process GFD data", exc_info=True)
+        except ijson.JSONError:
+            # A truncated or malformed file stops the stream, the rest of the file can't be read
+            self.transform_summary.increment_rows()
+            self.transform_summary.increment_failed_rows()
+            logger.warning("Failed to read the GFD data file", exc_info=True)
         self.transform_summary.mark_as_complete()
 
     def _get_bounding_box(self, polygon: list):
         """Get the bounding box from the polygon"""
-        lons, lats = zip(*polygon)  # Separate longitudes and latitudes
-        return [min(lons), min(lats), max(lons), max(lats)]
+        if not polygon:
+            raise ValueError("Cannot compute the bounding box of an empty footprint")
+        # Only the first two values of a position are used, altitudes must not end up in the bbox
+        if len(polygon) > _NUMPY_BBOX_MIN_POINTS:
+            coordinates = np.asarray(polygon, dtype=np.float64)[:, :2]
+            return [*coordinates.min(axis=0).tolist(), *coordinates.max(axis=0).tolist()]
+        min_lon = min_lat = float("inf")
+        max_lon = max_lat = float("-inf")
+        for position in polygon:
+            lon, lat = position[0], position[1]
+            if lon < min_lon:
+                min_lon = lon
+            if lon > max_lon:
+                max_lon = lon
+            if lat < min_lat:
+                min_lat = lat
+            if lat > max_lat:
+                max_lat = lat
+        return [min_lon, min_lat, max_lon, max_lat]
 
     def make_source_event_item(self, data: GFDSourceValidator) -> Item:
         """Create the source event item"""
 
         properties = data.properties
-        footprint = data.properties.system_footprint
+        footprint = properties.system_footprint
+        footprint_coordinates = footprint.coordinates
         # Note: Convert LinearRing to Polygon as LinearRing is not supported in STAC spec.
         # FIXME: This might be incorrect
-        geometry = {"type": "Polygon", "coordinates": [footprint.coordinates]}
+        geometry = {"type": "Polygon", "coordinates": [footprint_coordinates]}
 
         description = properties.dfo_main_cause
 
-        bbox = self._get_bounding_box(footprint.coordinates)
+        bbox = self._get_bounding_box(footprint_coordinates)
         # Episode number not in the source, so, set it to 1
         episode_number = 1
 
-        startdate = pytz.utc.localize(datetime.fromtimestamp(properties.system_time_start / 1000))
-        enddate = pytz.utc.localize(datetime.fromtimestamp(properties.system_time_end / 1000))
+        # GFD times are epoch milliseconds, convert them straight to UTC
+        startdate = datetime.fromtimestamp(properties.system_time_start / 1000, tz=timezone.utc)
+        enddate = datetime.fromtimestamp(properties.system_time_end / 1000, tz=timezone.utc)
 
         item = Item(
             id=f"{STAC_EVENT_ID_PREFIX}{properties.id}",
@@ -155,16 +202,19 @@ class GFDTransformer(MontyDataTransformer[GFDDataSource]):
         item.set_collection(self.get_event_collection())
         item.properties["roles"] = ["source", "event"]
 
-        MontyExtension.add_to(item)
-        monty = MontyExtension.ext(item)
+        monty = MontyExtension.ext(item, add_if_missing=True)
         monty.src_event_id = str(properties.id)
         monty.episode_number = episode_number
-        monty.country_codes = properties.cc.split(",")
-        monty.hazard_codes = ["MH0600", "nat-hyd-flo-flo", "FL"]  # GFD is a Flood related source
-        monty.hazard_codes = self.hazard_profiles.get_canonical_hazard_codes(item=item)
+        country_codes = properties.cc.split(",")
+        monty.country_codes = country_codes
+        if self._hazard_codes_cache is None:
+            monty.hazard_codes = list(_GFD_HAZARD_CODES)
+            canonical_hazard_codes = self.hazard_profiles.get_canonical_hazard_codes(item=item)
+            self._hazard_codes_cache = (canonical_hazard_codes, self.hazard_profiles.get_keywords(canonical_hazard_codes))
+        canonical_hazard_codes, hazard_keywords = self._hazard_codes_cache
+        monty.hazard_codes = list(canonical_hazard_codes)
 
-        hazard_keywords = self.hazard_profiles.get_keywords(monty.hazard_codes)
-        item.properties["keywords"] = list(set(hazard_keywords + monty.country_codes))
+        item.properties["keywords"] = list({*hazard_keywords, *country_codes})
 
         monty.compute_and_set_correlation_id(hazard_profiles=self.hazard_profiles)
 
@@ -173,8 +223,9 @@ class GFDTransformer(MontyDataTransformer[GFDDataSource]):
     def make_hazard_event_item(self, event_item: Item, row: GFDSourceValidator) -> Item:
         """Create hazard items"""
 
-        hazard_item = event_item.clone()
-        hazard_item.id = event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_HAZARD_ID_PREFIX)
+        hazard_item = self.make_derived_item(
+            source_item=event_item, item_id=event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_HAZARD_ID_PREFIX)
+        )
         hazard_item.properties["roles"] = ["source", "hazard"]
         hazard_item.set_collection(self.get_hazard_collection())
 
@@ -191,30 +242,29 @@ class GFDTransformer(MontyDataTransformer[GFDDataSource]):
 
     def make_impact_items(self, event_item: Item, src_data: GFDSourceValidator) -> List[Item]:
         """Returns the impact details related to flood"""
-        impact_fields = {
-            "dfo_dead": (MontyImpactExposureCategory.ALL_PEOPLE, MontyImpactType.DEATH),
-            "dfo_displaced": (MontyImpactExposureCategory.ALL_PEOPLE, MontyImpactType.TOTAL_DISPLACED_PERSONS),
-        }
-
+        properties = src_data.properties
+        event_title = event_item.properties["title"]
+        impact_id_prefix = f"{STAC_IMPACT_ID_PREFIX}{properties.id}-"
+        impact_collection = self.get_impact_collection()
         impact_items = []
-        for key_field, (category, impact_type) in impact_fields.items():
-            impact_item = event_item.clone()
-            impact_item.id = f"{STAC_IMPACT_ID_PREFIX}{src_data.properties.id}-{key_field}"
-            impact_item.properties["title"] = f"{event_item.properties['title']}-{key_field}"
+        for key_field, category, impact_type in _IMPACT_FIELDS:
+            impact_item = self.make_derived_item(source_item=event_item, item_id=f"{impact_id_prefix}{key_field}")
+            impact_item.properties["title"] = f"{event_title}-{key_field}"
             impact_item.properties["roles"] = ["source", "impact"]
-            impact_item.set_collection(self.get_impact_collection())
+            impact_item.set_collection(impact_collection)
 
             monty = MontyExtension.ext(impact_item)
             monty.impact_detail = ImpactDetail(
                 category=category,
                 type=impact_type,
-                value=getattr(src_data.properties, key_field),
+                value=getattr(properties, key_field),
                 unit="count",
                 estimate_type=MontyEstimateType.PRIMARY,
             )
             impact_items.append(impact_item)
         return impact_items
 
+    # FIXME: This is deprecated, get_stac_items streams the rows of data_source.get_data instead
     def check_and_get_gfd_data(self):
         """Get the GFD data"""
         return [item["properties"] for item in self.data_source.get_data()]
@@ -1,14 +1,17 @@
-import itertools
-import json
+import functools
+import heapq
 import logging
 import os
+import tempfile
 import typing
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Generator, Iterator, List, Optional
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional
 
 import ijson
-import pytz
+import numpy as np
+from pydantic import TypeAdapter
 from pystac import Asset, Item, Link
 
 from pystac_monty.extension import (
@@ -25,7 +28,7 @@ from pystac_monty.sources.common import (
     MontyDataSourceV3,
     MontyDataTransformer,
 )
-from pystac_monty.sources.utils import IDMCUtils, order_data_file
+from pystac_monty.sources.utils import IDMCUtils, json_dumps, json_loads, order_data_file
 from pystac_monty.validators.gidd import GiddValidator
 
 logger = logging.getLogger(__name__)
@@ -33,12 +36,65 @@ logger = logging.getLogger(__name__)
 STAC_EVENT_ID_PREFIX = "idmc-gidd-event-"
 STAC_IMPACT_ID_PREFIX = "idmc-gidd-impact-"
 
+# Geometries with more points than this get their bounding box from numpy
+_NUMPY_BBOX_MIN_POINTS = 32
+
+# Bytes read from the GIDD file per ijson read call (ijson's default is 64 KiB)
+_IJSON_READ_SIZE = 1 << 20
+# Files are grouped by event in partitions of about this many bytes of source JSON
+_SPILL_PARTITION_SIZE = 8 << 20
+_MAX_SPILL_PARTITIONS = 256
+_EVENT_ORDER_JQ_FILTER = '.features |= sort_by(.properties."Event ID")'
+
+# Validates all the figures of an event in a single pydantic-core call
+_GIDD_VALIDATOR_LIST = TypeAdapter(List[GiddValidator])
+
+
+@functools.lru_cache(maxsize=4096)
+def _date_to_utc_datetime(value: date) -> datetime:
+    """Midnight UTC of a GIDD date"""
+    return datetime.combine(value, time.min, tzinfo=timezone.utc)
+
+
+@functools.lru_cache(maxsize=4096)
+def _date_to_utc_isoformat(value: date) -> str:
+    """ISO string of a GIDD date, shared by figures on the same day"""
+    return _date_to_utc_datetime(value).isoformat()
+
+
+def _feature_event_id(feature: dict) -> Any:
+    """Event ID the figure belongs to, the figures of an event are transformed together"""
+    return feature.get("properties", {}).get("Event ID", "")
+
+
+def _event_id_sort_key(event_id: Any) -> tuple:
+    """Sort Event IDs the way jq sort_by does: nulls, then numbers, then strings"""
+    if event_id is None:
+        return (0, 0)
+    if isinstance(event_id, (int, float)):
+        return (1, event_id)
+    return (2, str(event_id))
+
+
+def _feature_sort_key(feature: dict) -> tuple:
+    return _event_id_sort_key(_feature_event_id(feature))
+
+
+def _group_features_by_event(features: Iterable[dict]) -> Iterator[List[dict]]:
+    """Yield the figures of each event together, sorted by Event ID, figures keep their order in the input"""
+    events: Dict[Any, List[dict]] = defaultdict(list)
+    for feature in features:
+        events[_feature_event_id(feature)].append(feature)
+    for event_id in sorted(events, key=_event_id_sort_key):
+        yield events[event_id]
+
 
 @dataclass
 class GIDDDataSource(MontyDataSourceV3):
     """GIDD data source version 2"""
 
     parsed_content: List[dict]
+    file_path: Optional[str] = None
     ordered_temp_file: Optional[str] = None
 
     def __init__(self, data: GenericDataSource, eoapi_url: str | None = None):
@@ -46,11 +102,10 @@ class GIDDDataSource(MontyDataSourceV3):
 
         def handle_file_data():
             if os.path.isfile(self.input_data.path):
-                jq_filter = '.features |= sort_by(.properties."Event ID")'
-                self.ordered_temp_file = order_data_file(filepath=self.input_data.path, jq_filter=jq_filter)
+                self.file_path = self.input_data.path
 
         def handle_memory_data():
-            self.parsed_content = json.loads(self.input_data.content)
+            self.parsed_content = json_loads(self.input_data.content)
 
         input_data_type = self.input_data.data_type
         match input_data_type:
@@ -61,8 +116,42 @@ class GIDDDataSource(MontyDataSourceV3):
             case _:
                 typing.assert_never(input_data_type)
 
+    def get_event_ordered_features(self) -> Iterator[dict]:
+        """
+        Stream the features of the file with the figures of each event next to each other
+
+        The features are first spilled, one per line, into temporary partition files keyed by the Event ID
+        hash, so only one partition has to be grouped in memory at a time. Each partition is then rewritten
+        sorted by Event ID and the partitions are merged, so the events come out sorted by Event ID.
+        """
+        partition_count = min(os.path.getsize(self.file_path) // _SPILL_PARTITION_SIZE + 1, _MAX_SPILL_PARTITIONS)
+        partitions = [tempfile.TemporaryFile() for _ in range(partition_count)]
+        try:
+            with open(self.file_path, "rb") as f:
+                for feature in ijson.items(f, "features.item", buf_size=_IJSON_READ_SIZE, use_float=True):
+                    partition = partitions[hash(_feature_event_id(feature)) % partition_count]
+                    partition.write(json_dumps(feature) + b"\n")
+            for partition in partitions:
+                partition.seek(0)
+                event_groups = list(_group_features_by_event(json_loads(line) for line in partition))
+                partition.seek(0)
+                partition.truncate()
+                for event_features in event_groups:
+                    for feature in event_features:
+                        partition.write(json_dumps(feature) + b"\n")
+                del event_groups
+                partition.seek(0)
+            # an event lives in a single partition, so the merge keeps its figures together
+            yield from heapq.merge(*((json_loads(line) for line in partition) for partition in partitions), key=_feature_sort_key)
+        finally:
+            for partition in partitions:
+                partition.close()
+
+    # FIXME: This is deprecated, the transformer streams get_event_ordered_features instead
     def get_ordered_tmp_file(self):
         """Get the temp file object which has ordered data"""
+        if self.ordered_temp_file is None and self.file_path:
+            self.ordered_temp_file = order_data_file(filepath=self.file_path, jq_filter=_EVENT_ORDER_JQ_FILTER)
         return self.ordered_temp_file
 
     def get_input_data_type(self) -> DataType:
@@ -88,15 +177,7 @@ class GIDDTransformer(MontyDataTransformer[GIDDDataSource]):
             self.transform_summary.increment_rows(len(gidd_data))
 
             try:
-
-                def get_validated_data(items: list[dict]) -> List[GiddValidator]:
-                    validated_data: list[GiddValidator] = []
-                    for item in items:
-                        obj = GiddValidator(**item)
-                        validated_data.append(obj)
-                    return validated_data
-
-                validated_data = get_validated_data(gidd_data)
+                validated_data = _GIDD_VALIDATOR_LIST.validate_python(gidd_data)
 
                 if event_item := self.make_source_event_item(data_items=validated_data):
                     impact_items = self.make_impact_items(event_item, validated_data)
@@ -128,6 +209,10 @@ class GIDDTransformer(MontyDataTransformer[GIDDDataSource]):
         Returns:
             List containing [min_x, min_y, max_x, max_y]
         """
+        if len(coordinates) > _NUMPY_BBOX_MIN_POINTS:
+            points = np.asarray(coordinates, dtype=np.float64)[:, :2]
+            return [*points.min(axis=0).tolist(), *points.max(axis=0).tolist()]
+
         # Extract longitudes and latitudes
         longitudes = [coord[0] for coord in coordinates]
         latitudes = [coord[1] for coord in coordinates]
@@ -145,6 +230,7 @@ class GIDDTransformer(MontyDataTransformer[GIDDDataSource]):
         data_item = data_items[0]
         # Create the geojson point
         # FIXME: We might need to get this from aggregating the figures
+        properties = data_item.properties
         geometry = data_item.geometry
         coordinates = geometry.coordinates
         bbox = self.make_bbox(coordinates)
@@ -153,48 +239,45 @@ class GIDDTransformer(MontyDataTransformer[GIDDDataSource]):
         episode_number = 1
 
         # FIXME: We might need to get this from aggregating the figures
-        startdate_str = data_item.properties.Event_start_date.strftime("%Y-%m-%d")
-        enddate_str = data_item.properties.Event_end_date.strftime("%Y-%m-%d")
-        startdate = pytz.utc.localize(datetime.fromisoformat(startdate_str))
-        enddate = pytz.utc.localize(datetime.fromisoformat(enddate_str))
+        startdate = _date_to_utc_datetime(properties.Event_start_date)
+        enddate = _date_to_utc_datetime(properties.Event_end_date)
 
         item = Item(
-            id=f"{STAC_EVENT_ID_PREFIX}{data_item.properties.Event_ID}",
+            id=f"{STAC_EVENT_ID_PREFIX}{properties.Event_ID}",
             geometry=dict(geometry),
             bbox=bbox,
             datetime=startdate,
             properties={
-                "title": data_item.properties.Event_name,
+                "title": properties.Event_name,
                 "start_datetime": startdate.isoformat(),
                 "end_datetime": enddate.isoformat(),
-                "location": data_item.properties.Locations_name,
-                "location_accuracy": data_item.properties.Locations_accuracy,
-                "location_type": data_item.properties.Locations_type,
-                "displacement_occured": data_item.properties.Displacement_occurred,
-                "sources": data_item.properties.Sources,
-                "publishers": data_item.properties.Publishers,
+                "location": properties.Locations_name,
+                "location_accuracy": properties.Locations_accuracy,
+                "location_type": properties.Locations_type,
+                "displacement_occured": properties.Displacement_occurred,
+                "sources": properties.Sources,
+                "publishers": properties.Publishers,
             },
         )
 
-        MontyExtension.add_to(item)
-        monty = MontyExtension.ext(item)
-        monty.src_event_id = str(data_item.properties.Event_ID)
+        monty = MontyExtension.ext(item, add_if_missing=True)
+        monty.src_event_id = str(properties.Event_ID)
         monty.episode_number = episode_number
-        monty.country_codes = [data_item.properties.ISO3]
+        monty.country_codes = [properties.ISO3]
 
-        if IDMCUtils.DisplacementType(data_item.properties.Figure_cause) == IDMCUtils.DisplacementType.DISASTER_TYPE:
+        if IDMCUtils.DisplacementType(properties.Figure_cause) == IDMCUtils.DisplacementType.DISASTER_TYPE:
             hazard_tuple = (
-                data_item.properties.Hazard_category,
-                data_item.properties.Hazard_sub_category,
-                data_item.properties.Hazard_type,
-                data_item.properties.Hazard_sub_type,
+                properties.Hazard_category,
+                properties.Hazard_sub_category,
+                properties.Hazard_type,
+                properties.Hazard_sub_type,
             )
             monty.hazard_codes = IDMCUtils.hazard_codes_mapping(hazard=hazard_tuple)
             monty.hazard_codes = self.hazard_profiles.get_canonical_hazard_codes(item=item)
 
         if monty.hazard_codes:
             hazard_keywords = self.hazard_profiles.get_keywords(monty.hazard_codes)
-            item.properties["keywords"] = list(set(hazard_keywords + monty.country_codes))
+            item.properties["keywords"] = list({*hazard_keywords, *monty.country_codes})
 
         monty.compute_and_set_correlation_id(hazard_profiles=self.hazard_profiles)
 
@@ -218,44 +301,37 @@ class GIDDTransformer(MontyDataTransformer[GIDDDataSource]):
     def make_impact_items(self, event_item: Item, data_items: List[GiddValidator]) -> List[Item]:
         """Create impact items"""
         items = []
+        impact_id_prefix = event_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
         for data_item in data_items:
-            impact_item = event_item.clone()
-
-            actual_start_date = data_item.properties.Start_date or data_item.properties.Stock_date
-            startdate_str = actual_start_date.strftime("%Y-%m-%d") if actual_start_date else None
-            # FIXME: this should work
-            startdate = pytz.utc.localize(datetime.fromisoformat(startdate_str)) if startdate_str else None
+            properties = data_item.properties
+            actual_start_date = properties.Start_date or properties.Stock_date
+            startdate = _date_to_utc_datetime(actual_start_date) if actual_start_date else None
 
-            actual_end_date = data_item.properties.End_date or data_item.properties.Stock_reporting_date
-            enddate_str = actual_end_date.strftime("%Y-%m-%d") if actual_end_date else None
-            enddate = pytz.utc.localize(datetime.fromisoformat(enddate_str)) if enddate_str else None
+            actual_end_date = properties.End_date or properties.Stock_reporting_date
 
             if not startdate:
                 raise Exception("Start date is not defined")
 
-            impact_type = data_item.properties.Figure_category or "displaced"
+            impact_type = properties.Figure_category or "displaced"
 
-            impact_item.id = (
-                impact_item.id.replace(STAC_EVENT_ID_PREFIX, STAC_IMPACT_ID_PREFIX)
-                + str(data_item.properties.ID)
-                + "-"
-                + impact_type
+            impact_item = self.make_derived_item(
+                source_item=event_item, item_id=f"{impact_id_prefix}{properties.ID}-{impact_type}"
             )
 
             impact_item.datetime = startdate
             impact_item.properties["title"] = (
-                f"{data_item.properties.Figure_category}-{data_item.properties.Figure_unit}-{data_item.properties.Figure_unit}-{data_item.properties.Event_name}"
+                f"{properties.Figure_category}-{properties.Figure_unit}-{properties.Figure_unit}-{properties.Event_name}"
             )
             impact_item.properties.update(
                 {
                     # FIXME: Do we need to store if the figure is FLOW or STOCK
-                    "start_datetime": startdate.isoformat() if startdate else None,
-                    "end_datetime": enddate.isoformat() if enddate else None,
-                    "figure_category": data_item.properties.Figure_category,
-                    "figure_unit": data_item.properties.Figure_unit,
-                    "figure_cause": data_item.properties.Figure_cause,
-                    "geographical_region": data_item.properties.Geographical_region,
-                    "country": data_item.properties.Country,
+                    "start_datetime": _date_to_utc_isoformat(actual_start_date),
+                    "end_datetime": _date_to_utc_isoformat(actual_end_date) if actual_end_date else None,
+                    "figure_category": properties.Figure_category,
+                    "figure_unit": properties.Figure_unit,
+                    "figure_cause": properties.Figure_cause,
+                    "geographical_region": properties.Geographical_region,
+                    "country": properties.Country,
                     "roles": ["source", "impact"],
                 }
             )
@@ -287,43 +363,35 @@ class GIDDTransformer(MontyDataTransformer[GIDDDataSource]):
         Returns:
             List of validated GIDD data dictionaries
         """
-        tmp_file = self.data_source.get_ordered_tmp_file()
         input_data_type = self.data_source.get_input_data_type()
         match input_data_type:
             case DataType.FILE:
-                with open(tmp_file.name, "rb") as f:
-                    items = ijson.items(f, "features.item")
-                    current_id = None
-                    group = []
-
-                    for item in items:
-                        item_properties = item.get("properties", {})
-                        figure_type = item_properties.get("Figure cause")
+                items = self.data_source.get_event_ordered_features()
+                current_id = None
+                group = []
+                disaster_figure_cause = IDMCUtils.DisplacementType.DISASTER_TYPE.value
+
+                for item in items:
+                    item_properties = item.get("properties", {})
+                    figure_type = item_properties.get("Figure cause")
+                    # Only disaster figures are kept, compare the raw value instead of building the enum
+                    if figure_type != disaster_figure_cause:
                         if figure_type not in IDMCUtils.DisplacementType._value2member_map_:
                             logger.warning("Invalid Figure cause. Skipping the event.")
-                            continue
-
-                        if (
-                            IDMCUtils.DisplacementType(item_properties.get("Figure cause"))
-                            == IDMCUtils.DisplacementType.DISASTER_TYPE
-                        ):
-                            item_id = item_properties["Event ID"] if "Event ID" in item_properties else ""
-                            if item_id != current_id:
-                                if group:
-                                    yield group
-                                group = [item]
-                                current_id = item_id
-                            else:
-                                group.append(item)
-
-                    if group:
-                        yield group
+                        continue
+
+                    item_id = item_properties.get("Event ID", "")
+                    if item_id != current_id:
+                        if group:
+                            yield group
+                        group = [item]
+                        current_id = item_id
+                    else:
+                        group.append(item)
+
+                if group:
+                    yield group
             case DataType.MEMORY:
-                data_contents = self.data_source.get_memory_data()
-                data_contents.sort(key=lambda x: x["properties"]["Event ID"])
-                yield from [
-                    list(group)
-                    for _, group in itertools.groupby(data_contents, key=lambda x: x["properties"].get("Event ID", " "))
-                ]
+                yield from _group_features_by_event(self.data_source.get_memory_data())
             case _:
                 typing.assert_never(input_data_type)
@@ -1,10 +1,17 @@
+import functools
 import json
 import logging
 import re
 import subprocess
 import tempfile
+import typing
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional, faster JSON parser
+    orjson = None
+
 from pystac_monty.extension import (
     MontyImpactExposureCategory,
     MontyImpactType,
@@ -17,6 +24,20 @@ def phrase_to_dashed(phrase: str) -> str:
     return re.sub(r"[^\w]+", "-", phrase).strip("-").lower()
 
 
+def json_loads(data: typing.Union[str, bytes]) -> typing.Any:
+    """Parse a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: typing.Any) -> bytes:
+    """Serialize to compact single-line JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
 def save_json_data_into_tmp_file(data: dict) -> tempfile._TemporaryFileWrapper:
     tmpfile = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
     data = json.dumps(data).encode("utf-8")
@@ -54,45 +75,53 @@ class IDMCUtils:
 
     """Utils for IDMC GIDD and IDU"""
 
+    # Source hazard (category, sub category, type, sub type) to hazard codes
+    hazard_mappings = {
+        ("geophysical", "geophysical", "earthquake", "earthquake"): ["GH0101", "nat-geo-ear-gro", "EQ"],
+        ("geophysical", "geophysical", "earthquake", "tsunami"): ["MH0705", "nat-geo-ear-tsu", "TS"],
+        ("geophysical", "geophysical", "mass movement", "dry mass movement"): ["GH0300", "nat-geo-mmd-lan", "LS"],
+        ("geophysical", "geophysical", "mass movement", "sinkhole"): ["GH0308", "nat-geo-mmd-sub", "OT"],
+        ("geophysical", "geophysical", "volcanic activity", "volcanic activity"): ["GH0205", "nat-geo-vol-vol", "VO"],
+        ("mixed disasters", "mixed disasters", "mixed disasters", "mixed disasters"): ["mix-mix-mix-mix"],
+        ("weather related", "climatological", "desertification", "desertification"): ["EN0206", "nat-geo-env-des", "OT"],
+        ("weather related", "climatological", "drought", "drought"): ["MH0401", "nat-cli-dro-dro", "DR"],
+        ("weather related", "climatological", "erosion", "erosion"): ["GH0403", "nat-geo-env-soi", "OT"],
+        ("weather related", "climatological", "salinisation", "salinization"): ["EN0303", "nat-geo-env-slr", "OT"],
+        ("weather related", "climatological", "sea level rise", "sea level rise"): ["EN0303", "nat-geo-env-slr", "OT"],
+        ("weather related", "climatological", "wildfire", "wildfire"): ["EN0205", "nat-cli-wil-wil", "WF"],
+        ("weather related", "hydrological", "flood", "dam release flood"): ["TL0009", "tec-mis-col-col", "FL"],
+        ("weather related", "hydrological", "flood", "flood"): ["MH0600", "nat-hyd-flo-flo", "FL"],
+        ("weather related", "hydrological", "mass movement", "avalanche"): ["MH0801", "nat-geo-mmd-ava", "AV"],
+        ("weather related", "hydrological", "mass movement", "landslide/wet mass movement"): [
+            "GH0300",
+            "nat-geo-mmd-lan",
+            "LS",
+        ],
+        ("weather related", "hydrological", "wave action", "rogue wave"): ["MH0701", "nat-hyd-wav-rog", "OT"],
+        ("weather related", "meteorological", "extreme temperature", "cold wave"): ["MH0502", "nat-met-ext-col", "CW"],
+        ("weather related", "meteorological", "extreme temperature", "heat wave"): ["MH0501", "nat-met-ext-hea", "HT"],
+        ("weather related", "meteorological", "storm", "hailstorm"): ["MH0404", "nat-met-sto-hai", "ST"],
+        ("weather related", "meteorological", "storm", "sand/dust storm"): ["MH0201", "nat-met-sto-san", "VW"],
+        ("weather related", "meteorological", "storm", "storm surge"): ["MH0703", "nat-met-sto-sur", "SS"],
+        ("weather related", "meteorological", "storm", "storm"): ["MH0301", "nat-met-sto-sto", "VW"],
+        ("weather related", "meteorological", "storm", "tornado"): ["MH0305", "nat-met-sto-tor", "TO"],
+        ("weather related", "meteorological", "storm", "typhoon/hurricane/cyclone"): ["MH0309", "nat-met-sto-tro", "TC"],
+        ("weather related", "meteorological", "storm", "winter storm/blizzard"): ["MH0403", "nat-met-sto-bli", "OT"],
+    }
+
     @staticmethod
     def hazard_codes_mapping(hazard: tuple) -> list[str]:
         """Map IDU hazards to UNDRR-ISC 2020 Hazard Codes"""
+        return list(IDMCUtils._get_hazard_codes(tuple(hazard)))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_hazard_codes(hazard: tuple) -> tuple[str, ...]:
+        """Look up the hazard codes once per distinct source hazard, many events share the same hazard"""
         hazard = tuple((item.lower() if item else item for item in hazard))
-        hazard_mapping = {
-            ("geophysical", "geophysical", "earthquake", "earthquake"): ["GH0101", "nat-geo-ear-gro", "EQ"],
-            ("geophysical", "geophysical", "earthquake", "tsunami"): ["MH0705", "nat-geo-ear-tsu", "TS"],
-            ("geophysical", "geophysical", "mass movement", "dry mass movement"): ["GH0300", "nat-geo-mmd-lan", "LS"],
-            ("geophysical", "geophysical", "mass movement", "sinkhole"): ["GH0308", "nat-geo-mmd-sub", "OT"],
-            ("geophysical", "geophysical", "volcanic activity", "volcanic activity"): ["GH0205", "nat-geo-vol-vol", "VO"],
-            ("mixed disasters", "mixed disasters", "mixed disasters", "mixed disasters"): ["mix-mix-mix-mix"],
-            ("weather related", "climatological", "desertification", "desertification"): ["EN0206", "nat-geo-env-des", "OT"],
-            ("weather related", "climatological", "drought", "drought"): ["MH0401", "nat-cli-dro-dro", "DR"],
-            ("weather related", "climatological", "erosion", "erosion"): ["GH0403", "nat-geo-env-soi", "OT"],
-            ("weather related", "climatological", "salinisation", "salinization"): ["EN0303", "nat-geo-env-slr", "OT"],
-            ("weather related", "climatological", "sea level rise", "sea level rise"): ["EN0303", "nat-geo-env-slr", "OT"],
-            ("weather related", "climatological", "wildfire", "wildfire"): ["EN0205", "nat-cli-wil-wil", "WF"],
-            ("weather related", "hydrological", "flood", "dam release flood"): ["TL0009", "tec-mis-col-col", "FL"],
-            ("weather related", "hydrological", "flood", "flood"): ["MH0600", "nat-hyd-flo-flo", "FL"],
-            ("weather related", "hydrological", "mass movement", "avalanche"): ["MH0801", "nat-geo-mmd-ava", "AV"],
-            ("weather related", "hydrological", "mass movement", "landslide/wet mass movement"): [
-                "GH0300",
-                "nat-geo-mmd-lan",
-                "LS",
-            ],
-            ("weather related", "hydrological", "wave action", "rogue wave"): ["MH0701", "nat-hyd-wav-rog", "OT"],
-            ("weather related", "meteorological", "extreme temperature", "cold wave"): ["MH0502", "nat-met-ext-col", "CW"],
-            ("weather related", "meteorological", "extreme temperature", "heat wave"): ["MH0501", "nat-met-ext-hea", "HT"],
-            ("weather related", "meteorological", "storm", "hailstorm"): ["MH0404", "nat-met-sto-hai", "ST"],
-            ("weather related", "meteorological", "storm", "sand/dust storm"): ["MH0201", "nat-met-sto-san", "VW"],
-            ("weather related", "meteorological", "storm", "storm surge"): ["MH0703", "nat-met-sto-sur", "SS"],
-            ("weather related", "meteorological", "storm", "storm"): ["MH0301", "nat-met-sto-sto", "VW"],
-            ("weather related", "meteorological", "storm", "tornado"): ["MH0305", "nat-met-sto-tor", "TO"],
-            ("weather related", "meteorological", "storm", "typhoon/hurricane/cyclone"): ["MH0309", "nat-met-sto-tro", "TC"],
-            ("weather related", "meteorological", "storm", "winter storm/blizzard"): ["MH0403", "nat-met-sto-bli", "OT"],
-        }
-        if hazard not in hazard_mapping:
+        if hazard not in IDMCUtils.hazard_mappings:
             raise KeyError(f"Hazard {hazard} not found.")
-        return hazard_mapping.get(hazard, [])
+        return tuple(IDMCUtils.hazard_mappings[hazard])
 
 
 def order_data_file(filepath: str, jq_filter: str):
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, HttpUrl
@@ -85,3 +86,8 @@ class GdacsEventDataValidator(BaseModelWithExtra):
     bbox: List[float]
     geometry: Geometry
     properties: Properties
+
+    @cached_property
+    def geometry_dict(self) -> dict:
+        """GeoJSON geometry as a plain dict, dumped once per event"""
+        return self.geometry.model_dump(by_alias=True, exclude_none=True)
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from functools import cached_property
 from typing import List, Union
 
 from pydantic import BaseModel, ConfigDict, HttpUrl
@@ -78,6 +79,11 @@ class Feature(BaseModelWithExtra):
     geometry: Geometry
     properties: Properties
 
+    @cached_property
+    def geometry_dict(self) -> dict:
+        """GeoJSON geometry as a plain dict, dumped once per feature"""
+        return self.geometry.model_dump(by_alias=True, exclude_none=True)
+
 
 # Define the schema for the feature collection
 class GdacsGeometryDataValidator(BaseModelWithExtra):
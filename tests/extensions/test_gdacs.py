@@ -4,20 +4,28 @@ import json
 import tempfile
 import typing
 import unittest
+from datetime import datetime, timedelta, timezone
 from os import makedirs
 from pathlib import Path
+from unittest import mock
 
 import pytest
+from markdownify import markdownify as md
 from parameterized import parameterized
+from pystac import Item, Link
+from shapely import get_coordinates, get_num_coordinates, simplify
+from shapely.geometry import Point, Polygon, shape
 
-from pystac_monty.extension import MontyExtension
+from pystac_monty.extension import MontyExtension, MontyImpactExposureCategory, MontyImpactType
 from pystac_monty.geocoding import MockGeocoder
 from pystac_monty.hazard_profiles import MontyHazardProfiles
+from pystac_monty.sources import gdacs
 from pystac_monty.sources.common import DataType, File, GdacsDataSourceType, GdacsEpisodes, GenericDataSource, Memory
 from pystac_monty.sources.gdacs import (
     GDACSDataSource,
     GDACSDataSourceType,
     GDACSTransformer,
+    _to_utc,
 )
 from pystac_monty.sources.utils import save_json_data_into_tmp_file
 from tests.conftest import get_data_file
@@ -494,3 +502,180 @@ class GDACSTest(unittest.TestCase):
         self.assertIsNotNone(source_event_item)
         self.assertIsNotNone(source_hazard_item)
         self.assertTrue(len(source_impact_items) >= 0)
+
+    def test_derived_item_shares_geometry_but_not_properties(self) -> None:
+        transformer = load_scenarios([(spain_flood, "FL")])[0]
+        source_item = Item(
+            id="gdacs-event-1-1",
+            geometry={"type": "Point", "coordinates": [0.0, 0.0]},
+            bbox=[0.0, 0.0, 0.0, 0.0],
+            datetime=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            properties={"roles": ["source", "event"], "keywords": ["Flooding"]},
+        )
+        source_item.add_link(Link("via", "https://www.test.com", "application/json", "GDACS Event Data"))
+        source_item.add_link(Link("related", "https://www.test.com/related"))
+
+        impact_item = transformer.make_derived_item(source_item=source_item, item_id="gdacs-impact-1-1")
+        impact_item.properties["keywords"].append("ESP")
+
+        self.assertEqual(impact_item.id, "gdacs-impact-1-1")
+        self.assertIs(impact_item.geometry, source_item.geometry)
+        self.assertEqual(source_item.properties["keywords"], ["Flooding"])
+        self.assertEqual([link.rel for link in impact_item.links], ["via"])
+
+    def test_datetimes_are_converted_to_utc(self) -> None:
+        utc_datetime = datetime(2024, 10, 29, 10, 0, tzinfo=timezone.utc)
+        self.assertEqual(_to_utc("2024-10-29T10:00:00"), utc_datetime)
+        self.assertEqual(_to_utc("2024-10-29T12:00:00+02:00").utcoffset(), timedelta(0))
+        self.assertEqual(_to_utc("2024-10-29T12:00:00+02:00").isoformat(), utc_datetime.isoformat())
+        self.assertEqual(_to_utc(datetime(2024, 10, 29, 5, 0, tzinfo=timezone(timedelta(hours=-5)))), utc_datetime)
+
+    def test_country_codes_keep_the_event_country_first(self) -> None:
+        transformer = load_scenarios([(drought_latam, "DR")])[0]
+        event_item = next(item for item in transformer.get_stac_items() if MontyExtension.ext(item).is_source_event())
+        monty = MontyExtension.ext(event_item)
+
+        self.assertEqual(monty.country_codes, ["ARG", "BOL", "BRA", "PRY"])
+        self.assertTrue(monty.correlation_id.startswith("20230611-ARG-"))
+        hazard_keywords = transformer.hazard_profiles.get_keywords(monty.hazard_codes)
+        self.assertEqual(event_item.properties["keywords"], [*hazard_keywords, "ARG", "BOL", "BRA", "PRY"])
+
+    def test_simplify_hazard_geometry(self) -> None:
+        def simplify_calls(geometry: Polygon, preserve_topology: bool = False) -> tuple[Polygon, list[bool]]:
+            with mock.patch.object(gdacs, "simplify", wraps=simplify) as simplify_mock:
+                simplified = gdacs._simplify_hazard_geometry(geometry, preserve_topology=preserve_topology)
+            return simplified, [call.kwargs["preserve_topology"] for call in simplify_mock.call_args_list]
+
+        circle = Point(0, 0).buffer(1, quad_segs=64)
+        simplified, calls = simplify_calls(circle)
+        self.assertEqual(calls, [False])
+        self.assertTrue(simplified.is_valid)
+        self.assertLess(get_num_coordinates(simplified), get_num_coordinates(circle))
+
+        # Douglas-Peucker collapses a polygon smaller than the tolerance, the topology preserving simplifier keeps it
+        tiny_triangle = Polygon([(0, 0), (0.001, 0), (0, 0.001)])
+        simplified, calls = simplify_calls(tiny_triangle)
+        self.assertEqual(calls, [False, True])
+        self.assertFalse(simplified.is_empty)
+        self.assertTrue(simplified.is_valid)
+
+        simplified, calls = simplify_calls(circle, preserve_topology=True)
+        self.assertEqual(calls, [True])
+        self.assertTrue(simplified.is_valid)
+
+    def test_simplify_tolerance_is_clamped(self) -> None:
+        self.assertEqual(gdacs._simplify_tolerance(Point(0, 0).buffer(0.01)), gdacs._SIMPLIFY_MIN_TOLERANCE)
+        self.assertEqual(gdacs._simplify_tolerance(Point(0, 0).buffer(50)), gdacs._SIMPLIFY_MAX_TOLERANCE)
+        # a 6 x 8 degree bbox has a 10 degree diagonal
+        medium_polygon = Polygon([(0, 0), (6, 0), (6, 8), (0, 8)])
+        self.assertAlmostEqual(gdacs._simplify_tolerance(medium_polygon), 10 * gdacs._SIMPLIFY_TOLERANCE_RATIO)
+
+    def test_small_hazard_footprint_is_not_simplified(self) -> None:
+        square = {"type": "Polygon", "coordinates": [[[0.1234567, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.1234567, 0.0]]]}
+        with mock.patch.object(gdacs, "simplify") as simplify_mock:
+            geometry, bbox = gdacs._make_hazard_footprint(square)
+        simplify_mock.assert_not_called()
+        self.assertIs(geometry, square)
+        self.assertEqual(bbox, [0.0, 0.0, 1.0, 1.0])
+
+        self.assertIsNone(gdacs._make_hazard_footprint({"type": "Polygon", "coordinates": []}))
+
+    @parameterized.expand(sorted(path.name for path in GDACS_FIXTURES.glob("*-geometry.json") if not path.name.startswith("tc-")))
+    def test_hazard_footprint_of_fixture(self, name: str) -> None:
+        source_geometry = gdacs._load_hazard_geometry_data(str(GDACS_FIXTURES / name)).features[0].geometry_dict
+        source_shape = shape(source_geometry)
+        geometry, bbox = gdacs._make_hazard_footprint(source_geometry)
+        footprint = shape(geometry)
+
+        self.assertFalse(footprint.is_empty)
+        if source_shape.is_valid:
+            self.assertTrue(footprint.is_valid)
+        self.assertLess(get_num_coordinates(footprint), get_num_coordinates(source_shape))
+        # The simplified vertices stay inside the source bounds (up to the snapping grid)
+        grid_size = gdacs._HAZARD_GEOMETRY_GRID_SIZE
+        source_bounds = source_shape.bounds
+        self.assertEqual(bbox, list(footprint.bounds))
+        for source_bound, bound in zip(source_bounds[:2], bbox[:2]):
+            self.assertGreaterEqual(bound, source_bound - grid_size)
+        for source_bound, bound in zip(source_bounds[2:], bbox[2:]):
+            self.assertLessEqual(bound, source_bound + grid_size)
+        # and are snapped to the grid
+        grid_steps = get_coordinates(footprint) / grid_size
+        self.assertLess(abs(grid_steps - grid_steps.round()).max(), 1e-6)
+
+    def test_load_hazard_geometry_data(self) -> None:
+        template = fixture_memory("tc-1001253-ep1-geometry.json")["features"][0]
+
+        def load_footprints(*feature_classes: str) -> list[float]:
+            features = [
+                {
+                    **template,
+                    "geometry": {"type": "Point", "coordinates": [float(i), 0.0]},
+                    "properties": {**template["properties"], "Class": c},
+                }
+                for i, c in enumerate(feature_classes)
+            ]
+            data_file = save_json_data_into_tmp_file({"type": "FeatureCollection", "features": features})
+            return [feature.geometry.coordinates[0] for feature in gdacs._load_hazard_geometry_data(data_file.name).features]
+
+        # The first Poly_Affected feature wins over any Poly_area feature
+        self.assertEqual(load_footprints("Point_Centroid", "Poly_area", "Poly_Affected", "Poly_Affected"), [2.0])
+        # otherwise the first Poly_area feature is kept
+        self.assertEqual(load_footprints("Poly_area", "Point_Centroid", "Poly_area"), [0.0])
+        self.assertEqual(load_footprints("Point_Centroid", "Poly_Green"), [])
+
+    def test_preserve_topology_option(self) -> None:
+        data_source = load_scenarios([(spain_flood, "FL")])[0].data_source
+        self.assertFalse(GDACSTransformer(data_source, MockGeocoder()).preserve_topology)
+        self.assertTrue(GDACSTransformer(data_source, MockGeocoder(), preserve_topology=True).preserve_topology)
+
+    def test_html_to_markdown_matches_markdownify(self) -> None:
+        descriptions = [
+            "Flood in Spain",
+            "Green alert for flood in Spain, 2 days",
+            " leading and trailing spaces ",
+            'Score: 1.5 (max 3) - see the report #1, [details] and 100% of "population"',
+            "snake_case and *stars*",
+            "double  space",
+            "tab\tnewline\ncarriage\rreturn",
+            "form\x0cfeed and vertical\x0btab",
+            "R&amp;D &lt;ok&gt;",
+            "<p>Flood in <b>Spain</b></p>",
+            "Moderate<br/>impact",
+        ]
+        for description in descriptions:
+            with self.subTest(description=description):
+                self.assertEqual(gdacs._html_to_markdown(description), md(description))
+
+        # plain text skips markdownify
+        with mock.patch.object(gdacs, "md") as md_mock:
+            self.assertEqual(gdacs._html_to_markdown("Orange alert for drought"), "Orange alert for drought")
+        md_mock.assert_not_called()
+
+    def test_sendai_indicator_mappings(self) -> None:
+        self.assertEqual(
+            GDACSTransformer.get_impact_category_from_sendai_indicators("A", "death"), MontyImpactExposureCategory.ALL_PEOPLE
+        )
+        self.assertEqual(GDACSTransformer.get_impact_type_from_sendai_indicators("B", "displaced"), MontyImpactType.RELOCATED)
+        self.assertEqual(
+            GDACSTransformer.get_impact_category_from_sendai_indicators("C", "houses"), MontyImpactExposureCategory.BUILDINGS
+        )
+        for sendaitype, sendainame in [("D", "transport"), ("G", "death"), ("Z", "death")]:
+            with self.assertRaises(ValueError):
+                GDACSTransformer.get_impact_category_from_sendai_indicators(sendaitype, sendainame)
+        for sendaitype, sendainame in [("A", "unknown"), ("G", "death"), ("Z", "death")]:
+            with self.assertRaises(ValueError):
+                GDACSTransformer.get_impact_type_from_sendai_indicators(sendaitype, sendainame)
+
+    @pytest.mark.vcr()
+    def test_transformer_batch_shares_transform_summary(self) -> None:
+        flood_transformer, drought_transformer = load_scenarios([(spain_flood, "FL"), (drought_latam, "DR")])
+
+        flood_data_source = flood_transformer.data_source
+        items = list(flood_transformer.get_stac_items_batch([flood_data_source, drought_transformer.data_source]))
+
+        event_ids = {MontyExtension.ext(item).src_event_id for item in items if MontyExtension.ext(item).is_source_event()}
+        self.assertEqual(event_ids, {"1102983", "1016449"})
+        self.assertEqual(flood_transformer.transform_summary.total_rows, 2)
+        self.assertEqual(flood_transformer.transform_summary.success_rows, 2)
+        self.assertIs(flood_transformer.data_source, flood_data_source)
@@ -289,3 +289,60 @@ class GFDTest(unittest.TestCase):
             if monty_item_ext.is_source_hazard() and monty_item_ext.hazard_codes:
                 # Should contain only the first code (UNDRR-ISC 2025)
                 assert len(monty_item_ext.hazard_codes) == 1
+
+    def test_file_rows_are_streamed(self) -> None:
+        data_source = load_scenarios_from_file(data)[0].data_source
+
+        rows = data_source.get_data()
+
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(list(rows), data)
+
+    def test_check_and_get_gfd_data(self) -> None:
+        transformer = load_scenarios_from_file(data)[0]
+
+        self.assertEqual(transformer.check_and_get_gfd_data(), [row["properties"] for row in data])
+
+    def test_malformed_file_is_reported_in_summary(self) -> None:
+        transformer = load_scenarios_from_file(data)[0]
+        with open(transformer.data_source.file_path, "r+", encoding="utf-8") as f:
+            content = f.read()
+            f.seek(0)
+            # truncated in the middle of the first row
+            f.write(content[: len(content) // 2])
+            f.truncate()
+
+        self.assertEqual(list(transformer.get_stac_items()), [])
+        self.assertEqual(transformer.transform_summary.total_rows, 1)
+        self.assertEqual(transformer.transform_summary.failed_rows, 1)
+        self.assertTrue(transformer.transform_summary.is_completed)
+
+    def test_bounding_box_of_large_footprint(self) -> None:
+        transformer = load_scenarios(data)[0]
+        footprint = [[-10.0 + i * 0.5, 5.0 - (i % 7)] for i in range(40)] + [[-10.0, 5.0]]
+
+        bbox = transformer._get_bounding_box(footprint)
+
+        self.assertEqual(bbox, [-10.0, -1.0, 9.5, 5.0])
+        self.assertTrue(all(type(value) is float for value in bbox))
+
+    def test_bounding_box_of_empty_footprint(self) -> None:
+        transformer = load_scenarios(data)[0]
+
+        with self.assertRaises(ValueError):
+            transformer._get_bounding_box([])
+
+        # the row is counted as failed
+        row = json.loads(json.dumps(data[0]))
+        row["properties"]["system:footprint"]["coordinates"] = []
+        transformer = load_scenarios([row])[0]
+        self.assertEqual(list(transformer.get_stac_items()), [])
+        self.assertEqual(transformer.transform_summary.failed_rows, 1)
+
+    def test_bounding_box_ignores_altitude(self) -> None:
+        transformer = load_scenarios(data)[0]
+        small_footprint = [[1.0, 2.0, 500.0], [3.0, -4.0, -20.0], [1.0, 2.0, 500.0]]
+        large_footprint = [[-10.0 + i * 0.5, 5.0 - (i % 7), 1000.0] for i in range(40)] + [[-10.0, 5.0, -1000.0]]
+
+        self.assertEqual(transformer._get_bounding_box(small_footprint), [1.0, -4.0, 3.0, 2.0])
+        self.assertEqual(transformer._get_bounding_box(large_footprint), [-10.0, -1.0, 9.5, 5.0])
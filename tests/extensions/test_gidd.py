@@ -4,6 +4,7 @@ import json
 import unittest
 from os import makedirs
 from typing import List
+from unittest import mock
 
 import pytest
 import requests
@@ -12,6 +13,7 @@ from parameterized import parameterized
 from pystac_monty.extension import MontyExtension
 from pystac_monty.geocoding import MockGeocoder
 from pystac_monty.hazard_profiles import MontyHazardProfiles
+from pystac_monty.sources import gidd
 from pystac_monty.sources.common import DataType, File, Memory
 from pystac_monty.sources.gidd import GenericDataSource, GIDDDataSource, GIDDTransformer
 from pystac_monty.sources.utils import IDMCUtils, save_json_data_into_tmp_file
@@ -209,3 +211,95 @@ class GIDDTest(unittest.TestCase):
             "nat-geo-vol-vol",
             "VO",
         ]
+
+    def test_bounding_box_of_large_geometry(self) -> None:
+        data_source = GIDDDataSource(
+            data=GenericDataSource(source_url="https://gidd.test", input_data=Memory(content="[]", data_type=DataType.MEMORY))
+        )
+        transformer = GIDDTransformer(data_source, MockGeocoder())
+        coordinates = [[-10.0 + i * 0.5, 5.0 - (i % 7)] for i in range(40)]
+
+        bbox = transformer.make_bbox(coordinates)
+
+        self.assertEqual(bbox, [-10.0, -1.0, 9.5, 5.0])
+        self.assertTrue(all(type(value) is float for value in bbox))
+        self.assertEqual(transformer.make_bbox(coordinates[:3]), [-10.0, 3.0, -9.0, 5.0])
+
+    def test_file_features_grouped_by_event(self) -> None:
+        def feature(figure_id: int, event_id: int) -> dict:
+            return {
+                "type": "Feature",
+                "geometry": {"type": "MultiPoint", "coordinates": [[10.0, 20.0], [11.0, 19.0]]},
+                "properties": {
+                    "ID": figure_id,
+                    "ISO3": "NPL",
+                    "Country": "Nepal",
+                    "Geographical region": "South Asia",
+                    "Figure cause": "Disaster",
+                    "Figure category": "Internal Displacements",
+                    "Figure unit": "Person",
+                    "Total figures": 10,
+                    "Hazard category": "Weather related",
+                    "Hazard sub category": "Hydrological",
+                    "Hazard type": "Flood",
+                    "Hazard sub type": "Flood",
+                    "Start date": "2024-01-01",
+                    "End date": "2024-02-01",
+                    "Publishers": ["p"],
+                    "Sources": ["s"],
+                    "Event ID": event_id,
+                    "Event name": f"Event {event_id}",
+                    "Event start date": "2024-01-01",
+                    "Event end date": "2024-02-01",
+                    "Locations name": ["a"],
+                    "Locations accuracy": ["b"],
+                    "Locations type": ["c"],
+                },
+            }
+
+        event_ids = [7, 3, 7, 5, 3, 9, 7]
+        features = [feature(i, event_id) for i, event_id in enumerate(event_ids)]
+        data_file = save_json_data_into_tmp_file({"type": "FeatureCollection", "features": features})
+
+        def load_data_source() -> GIDDDataSource:
+            return GIDDDataSource(
+                data=GenericDataSource(
+                    source_url="https://gidd.test", input_data=File(path=data_file.name, data_type=DataType.FILE)
+                )
+            )
+
+        def transform(data_source: GIDDDataSource | None = None) -> dict[str, list[str]]:
+            data_source = data_source or load_data_source()
+            impacts_by_event: dict[str, list[str]] = {}
+            for item in GIDDTransformer(data_source, MockGeocoder()).get_stac_items():
+                if MontyExtension.ext(item).is_source_event():
+                    impacts_by_event[item.id] = []
+                else:
+                    # impact items directly follow the item of their event
+                    list(impacts_by_event.values())[-1].append(item.id)
+            return impacts_by_event
+
+        # events are sorted by Event ID, figures keep their order in the file
+        expected = [
+            ("idmc-gidd-event-3", [f"idmc-gidd-impact-3{i}-Internal Displacements" for i in (1, 4)]),
+            ("idmc-gidd-event-5", ["idmc-gidd-impact-53-Internal Displacements"]),
+            ("idmc-gidd-event-7", [f"idmc-gidd-impact-7{i}-Internal Displacements" for i in (0, 2, 6)]),
+            ("idmc-gidd-event-9", ["idmc-gidd-impact-95-Internal Displacements"]),
+        ]
+        self.assertEqual(list(transform().items()), expected)
+
+        # Spill the features into several partition files
+        with mock.patch.object(gidd, "_SPILL_PARTITION_SIZE", 256):
+            self.assertEqual(list(transform().items()), expected)
+
+        memory_data_source = GIDDDataSource(
+            data=GenericDataSource(
+                source_url="https://gidd.test", input_data=Memory(content=json.dumps(features), data_type=DataType.MEMORY)
+            )
+        )
+        self.assertEqual(list(transform(memory_data_source).items()), expected)
+
+        # The deprecated jq ordered file is still created on request
+        with open(load_data_source().get_ordered_tmp_file().name) as f:
+            ordered_event_ids = [feature["properties"]["Event ID"] for feature in json.load(f)["features"]]
+        self.assertEqual(ordered_event_ids, sorted(event_ids))
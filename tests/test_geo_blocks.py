@@ -0,0 +1,47 @@
+"""Tests for the geo block lookup behind correlation ids."""
+
+from __future__ import annotations
+
+import pytest
+
+from pystac_monty.geo_blocks import GeoBlocks
+from pystac_monty.paring import Pairing
+
+
+def _uncached_block_id(lat: float, lon: float) -> int:
+    geoblocks_df = GeoBlocks.get_geoblocks_df()
+    geoblocks_filtered_df = geoblocks_df[
+        (geoblocks_df["lat_min"] <= lat)
+        & (geoblocks_df["lat_max"] > lat)
+        & (geoblocks_df["lon_min"] <= lon)
+        & (geoblocks_df["lon_max"] > lon)
+    ]
+    return int(geoblocks_filtered_df["block_id"].iloc[0]) if len(geoblocks_filtered_df) else 0
+
+
+# Blocks are 0.2 degree wide, so every other 0.1 degree centroid falls on a block edge
+@pytest.mark.parametrize(
+    "bbox",
+    [
+        [-3.75, 40.35, -3.65, 40.45],  # centroid on both edges (40.4, -3.7)
+        [-3.8, 40.3, -3.6, 40.5],
+        [-3.74, 40.34, -3.64, 40.44],  # centroid rounded up onto an edge
+        [-3.66, 40.46, -3.56, 40.56],  # centroid inside a block
+        [-0.05, -0.05, 0.05, 0.05],  # equator and prime meridian
+        [179.7, 89.7, 179.9, 89.9],  # last block
+        [-180.0, -90.0, -179.9, -89.9],  # first block
+        [179.95, 0.0, 180.05, 0.2],  # east of the last block
+    ],
+)
+def test_block_id_matches_uncached_lookup(bbox: list[float]) -> None:
+    lat, lon = Pairing()._return_bbox_centroid_coordinates(bbox)
+
+    block_id = GeoBlocks.get_block_id(lat=lat, lon=lon)
+
+    assert block_id == _uncached_block_id(lat, lon)
+    # served from the cache the second time
+    assert GeoBlocks.get_block_id(lat=lat, lon=lon) == block_id
+
+
+def test_block_id_outside_every_block() -> None:
+    assert GeoBlocks.get_block_id(lat=0.0, lon=180.0) == _uncached_block_id(0.0, 180.0) == 0